@@ -4,34 +4,72 @@
 # IMPORT MODULES #
 ##################
 
+import argparse
+import hashlib
 import importlib
-import subprocess
+import importlib.util
+import logging
+import logging.handlers
+import os
+import re
+import signal
 import sys
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from functools import lru_cache
+
+# Modules already loaded through import_python_module (module name -> module)
+IMPORTED_MODULES = {}
 
 def import_python_module(module_name, package_name=None, from_import=None):
-    # ===============================================================================
-    # Dynamically import a module; if missing, attempt to install the package via pip
-    # On failure, provide clearer instructions rather than silently exiting
-    # ===============================================================================
-    try:
-        module = importlib.import_module(module_name)
+    # ==================================================================================
+    # Import a third-party module; only if it is really missing, try to install it via pip
+    # Set PLEX_NFO_NO_AUTO_INSTALL=1 (environment) to never run pip automatically
+    # ==================================================================================
+    def print_manual_install_help(pkg):
+        print("Please install the dependency manually and re-run (recommended inside a virtualenv):")
+        print(f"  python -m venv .venv && ./.venv/bin/pip install {pkg}  # macOS/Linux")
+        print(f"  py -3 -m venv .venv && .\\.venv\\Scripts\\pip install {pkg}  # Windows (PowerShell/CMD)")
 
-    except ImportError:
-        pkg = package_name or module_name.split(".")[0]
-        print(f"WARNING: Module '{module_name}' not found. Attempting to install '{pkg}' via pip...")
+    module = IMPORTED_MODULES.get(module_name)
 
+    if module is None:
+        # find_spec() only locates the module; raises if a parent package is missing
         try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
+            spec = importlib.util.find_spec(module_name)
 
-        except subprocess.CalledProcessError as exc:
-            print(f"ERROR: Failed to install '{pkg}' automatically: {exc}")
-            print("Please install the dependency manually and re-run (recommended inside a virtualenv):")
-            print(f"  python -m venv .venv && ./.venv/bin/pip install {pkg}  # macOS/Linux")
-            print(f"  py -3 -m venv .venv && .\\.venv\\Scripts\\pip install {pkg}  # Windows (PowerShell/CMD)")
-            sys.exit(1)
+        except ModuleNotFoundError:
+            spec = None
+
+        if spec is None:
+            pkg = package_name or module_name.split(".")[0]
+
+            if os.environ.get("PLEX_NFO_NO_AUTO_INSTALL", "") not in ("", "0"):
+                print(f"ERROR: Module '{module_name}' not found and automatic installation is disabled (PLEX_NFO_NO_AUTO_INSTALL).")
+                print_manual_install_help(pkg)
+                sys.exit(1)
+
+            print(f"WARNING: Module '{module_name}' not found. Attempting to install '{pkg}' via pip...")
+
+            # Only needed on this (rare) path, so not imported at startup
+            import subprocess
+
+            try:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
+
+            except subprocess.CalledProcessError as exc:
+                print(f"ERROR: Failed to install '{pkg}' automatically: {exc}")
+                print_manual_install_help(pkg)
+                sys.exit(1)
+
+            # Make the freshly installed package visible to the import system
+            importlib.invalidate_caches()
 
-        # try import again
         module = importlib.import_module(module_name)
+        IMPORTED_MODULES[module_name] = module
 
     if from_import:
         try:
@@ -44,22 +82,23 @@ def import_python_module(module_name, package_name=None, from_import=None):
     return module
 
 
-# Standard library (loaded via helper for consistency with your pattern)
-os = import_python_module("os")
-time = import_python_module("time")
-argparse = import_python_module("argparse")
-ET = import_python_module("xml.etree.ElementTree")
-re = import_python_module("re")
-unicodedata = import_python_module("unicodedata")
-quote_plus = import_python_module("urllib.parse", from_import="quote_plus")
-datetime = import_python_module("datetime")
-
 # Third-party
 PlexServer = import_python_module("plexapi.server", package_name="plexapi", from_import="PlexServer")
+NotFound = import_python_module("plexapi.exceptions", package_name="plexapi", from_import="NotFound")
 load_dotenv = import_python_module("dotenv", package_name="python-dotenv", from_import="load_dotenv")
+diskcache = import_python_module("diskcache")
+requests = import_python_module("requests")
+HTTPAdapter = import_python_module("requests.adapters", package_name="requests", from_import="HTTPAdapter")
+Retry = import_python_module("urllib3.util.retry", package_name="urllib3", from_import="Retry")
+
+# XML backend: prefer lxml (C parser, tolerant of malformed NFOs), fall back to the standard library
+try:
+    ET = importlib.import_module("lxml.etree")
+    LXML_AVAILABLE = True
 
-# Load environment variables
-load_dotenv()
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
 
 
 
@@ -67,65 +106,96 @@ load_dotenv()
 # VARIABLES #
 #############
 
+# Date of this run (YYYY-MM-DD), formatted once
+RUN_DATE = date.today().strftime("%Y-%m-%d")
+
 # ==== CONFIGURATIONS ====
 SCRIPT_NAME = "Plex NFO Updater" # Used in some prints/logs
-LOG_FILE = f"{SCRIPT_NAME.lower().replace(' ', '_')}-{datetime.date.today():%Y-%m-%d}.log" # Log file path
+LOG_FILE = f"{SCRIPT_NAME.lower().replace(' ', '_')}-{RUN_DATE}.log" # Log file path
 
-CUSTOM_DELAY = 0.4 # Used to wait after an edit/upload
+CACHE_DIR = os.path.expanduser("~/.cache/plex-nfo-updater") # Remembers NFO files already applied to Plex (use --force to ignore it)
+
+PLEX_RPS = None # Max Plex write requests (edit/upload) per second; if None, read PLEX_RPS from .env (default: 10, 0 disables the limit)
 
 PLEX_URL = None     # If you don't want to use .env file, change this value to: http://your-plex:32400
 PLEX_TOKEN = None   # If you don't want to use .env file, change this value to your Plex Token
+PLEX_TIMEOUT = (3.05, 30) # Plex connect/read timeouts (seconds)
+MAX_WORKERS = 8 # Number of NFO files processed in parallel in automatic mode (1 = one by one)
 
 # The script will look for directories inside these (e.g. ".../tv/<show name>" or ".../movies/<movie name>")
-ROOT_PLEX_SHOW_DIR = ["tv", "serie", "series", "show", "shows", "tvshow", "tvshows"]
-ROOT_PLEX_MOVIE_DIR = ["movie", "movies"]
-ALLOW_ART_EXT = ("mp3", "m4a", "jpg", "jpeg", "png", "tbn") # This will be used to search additional files after NFO files (IMPORTANT: Need to have same name as NFO file)
+ROOT_PLEX_SHOW_DIR = frozenset(("tv", "serie", "series", "show", "shows", "tvshow", "tvshows"))
+ROOT_PLEX_MOVIE_DIR = frozenset(("movie", "movies"))
+ALLOW_ART_EXT = frozenset(("mp3", "m4a", "jpg", "jpeg", "png", "tbn")) # This will be used to search additional files after NFO files (IMPORTANT: Need to have same name as NFO file)
 # ========================
 
-# ----------------------------
-# Parse command-line arguments
-# ----------------------------
-parser = argparse.ArgumentParser(description=f"{SCRIPT_NAME} (Movies/Series)")
-
-parser.add_argument("--dry-run",            action="store_true",        dest="dry_run",             default=None,   help="Don't perform edits/uploads; just print intended actions")
-parser.add_argument("--debug-mode",         action="store_true",        dest="debug_mode",          default=False,  help="Enable debug-level console output")
-parser.add_argument("--scan-path",                                      dest="scan_path",type=str,  default=None,   help="Path to scan (non-interactive mode)")
-parser.add_argument("--logging",            action="store_true",        dest="logging",             default=True,   help="Enable/disable logging to file (default: ON)")
-parser.add_argument("--no-logging",         action="store_false",       dest="logging",                             help="Disable logging to file")
-parser.add_argument("--allow-unlock",       action="store_true",        dest="allow_unlock",        default=True,   help="Allow unlocking locked fields before editing")
-parser.add_argument("--no-unlock",          action="store_false",       dest="allow_unlock",                        help="Disallow unlocking locked fields")
-parser.add_argument("--update-art",         action="store_true",        dest="update_art",          default=True,   help="Enable artwork updates (default: ON)")
-parser.add_argument("--no-art",             action="store_false",       dest="update_art",                          help="Disable artwork updates")
-parser.add_argument("--always-update-art",  action="store_true",        dest="always_update_art",   default=False,  help="Force artwork updates even if metadata hasn't changed (except in dry-run)")
-
-args = parser.parse_args()
-
-# ----------------------------------
-# Assign parsed arguments to globals
-# ----------------------------------
-LOGGING = args.logging
-SCRIPT_NAME = SCRIPT_NAME
-ALLOW_UNLOCK = args.allow_unlock
-ALLOW_ART_UPDATE = args.update_art
-ALWAYS_UPDATE_ART = args.always_update_art
-DRY_RUN = args.dry_run
-DEBUG_MODE = args.debug_mode
-SCAN_PATH = args.scan_path
-
-# -------------------
-# Debug print summary
-# -------------------
-if DEBUG_MODE:
-    print(f"[DEBUG] {SCRIPT_NAME} configuration:")
-    print(f"  LOGGING:            {LOGGING}")
-    print(f"  ALLOW_UNLOCK:       {ALLOW_UNLOCK}")
-    print(f"  ALLOW_ART_UPDATE:   {ALLOW_ART_UPDATE}")
-    print(f"  ALWAYS_UPDATE_ART:  {ALWAYS_UPDATE_ART}")
-    print(f"  DRY_RUN:            {DRY_RUN}")
-    print(f"  SCAN_PATH:          {SCAN_PATH}")
-    print(f"  LOG_FILE:           {LOG_FILE}")
-
+# Normalized artwork extensions (lowercase, without leading dot), computed once
+ALLOW_ART_EXT_NORMALIZED = frozenset(e.lower().lstrip(".") for e in ALLOW_ART_EXT)
+
+# Lowercase root directory names, computed once for case-insensitive path matching
+ROOT_PLEX_SHOW_DIR_LOWER = frozenset(r.lower() for r in ROOT_PLEX_SHOW_DIR)
+ROOT_PLEX_MOVIE_DIR_LOWER = frozenset(r.lower() for r in ROOT_PLEX_MOVIE_DIR)
+
+# Artwork filename keywords -> (Plex upload method, lockable field); first keyword found in the filename wins
+ARTWORK_UPLOAD_MAP = {
+    "poster":    ("uploadPoster",    "thumb"),
+    "fanart":    ("uploadArt",       "art"),
+    "backdrop":  ("uploadArt",       "art"),
+    "background":("uploadArt",       "art"),
+    "art":       ("uploadArt",       "art"),
+    "theme":     ("uploadTheme",     "theme"),
+}
 
+# Directories never scanned for NFO files (hidden directories, starting with ".", are skipped too)
+SKIP_SCAN_DIRS = frozenset(("@eaDir", ".AppleDouble"))
+
+# External ID sources read from NFO files and looked up in Plex (in this order)
+NFO_ID_TYPES = ("imdb", "tmdb", "tvdb")
+
+# Number of threads reading directories in parallel while looking for NFO files (helps on NAS/SMB mounts)
+SCAN_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# ==== PRECOMPILED REGEX ====
+TRAILING_YEAR_RE = re.compile(r'\s*[\-\(\[\{]\s*(\d{4})[\)\]\}]?$') # Trailing year in a title (e.g. "(1999)", "- 1999"), year captured
+NOISE_KEYWORDS_RE = re.compile(r'sample|trailer|teaser|promo|deleted scene|behind the scenes', re.IGNORECASE) # Extras, not the real media
+THROTTLE_STATUS_RE = re.compile(r'\((429|503)\)')                   # Plex "too many requests"/"unavailable" status in plexapi errors
+WHITESPACE_RE = re.compile(r'\s+')                                  # Runs of whitespace in titles
+NFO_TITLE_BYTES_RE = re.compile(rb'<title(?:\s[^>]*)?>(?!\s*</)', re.IGNORECASE) # Non-empty <title> in raw NFO bytes
+# ===========================
+
+# Separators used in combined tag fields (e.g. "Action / Adventure"); split with translate() + split(",")
+TAG_SEPARATORS = frozenset(",/|;")
+TAG_SEPARATORS_TO_COMMA = str.maketrans("/|;", ",,,")
+
+# ==== ASCII FOLDING TABLE ====
+# Accented Latin letters (U+00C0-U+024F) mapped to their unaccented form, computed once for str.translate()
+ASCII_FOLD_TABLE = {}
+for code_point in range(0x00C0, 0x0250):
+    folded = "".join(ch for ch in unicodedata.normalize("NFKD", chr(code_point)) if not unicodedata.combining(ch))
+    if folded != chr(code_point):
+        ASCII_FOLD_TABLE[code_point] = folded
+del code_point, folded
+# =============================
+
+# ----------------------------------------------------------------
+# Command-line options (defaults, set from the arguments in main())
+# ----------------------------------------------------------------
+LOGGING = True
+ALLOW_UNLOCK = True
+ALLOW_ART_UPDATE = True
+ALWAYS_UPDATE_ART = False
+DRY_RUN = None
+DEBUG_MODE = False
+SCAN_PATH = None
+FORCE_UPDATE = False
+
+# ---------------------------------------------------------------
+# Logger used by log(); the log file is attached in main() (see setup_file_logging)
+# ---------------------------------------------------------------
+LOG_LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "SUCCESS": 25, "WARN": logging.WARNING, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+
+logger = logging.getLogger("plex_nfo")
+logger.propagate = False
+logger.addHandler(logging.NullHandler())  # No file logging: never fall back to stderr
 
 # ------------------------------------------------------------------------------
 # Unified mapping of logical NFO fields to Plex API fields for batch editing
@@ -161,18 +231,62 @@ SUPPORTED_FIELD_MAP = {
     "actor":         {"rest_field": "actors",                "is_tag": True},  # alias
 }
 
+# Same map flattened once to tuples for the per-field loop: {nfo_tag: (rest_field, is_tag)}
+SUPPORTED_FIELD_LOOKUP = {tag: (info["rest_field"], info["is_tag"]) for tag, info in SUPPORTED_FIELD_MAP.items()}
+
+# Singular name of each tag collection, taken from the NFO aliases: {"genres": "genre", "countries": "country", ...}
+TAG_FIELD_SINGULAR = {info["rest_field"]: tag for tag, info in SUPPORTED_FIELD_MAP.items() if info["is_tag"] and tag != info["rest_field"]}
+
+# Safe batching size for editTags calls, to avoid Plex API URL limits
+MAX_TAG_BATCH = 5
+
+# Parser options for NFO files (lxml only): recover from malformed NFOs instead of aborting the run
+NFO_ITERPARSE_KWARGS = {"remove_blank_text": True, "huge_tree": False, "recover": True} if LXML_AVAILABLE else {}
+
+# Output format of parse_nfo_to_dict, part of the parsed NFO cache keys: bump it whenever that output changes
+NFO_PARSER_VERSION = 2
+
 STATS = {
         "processed_nfo": 0,
+        "unchanged_nfo": 0,
         "updated": [],
         "skipped": [],
+        "skipped_missing_field": [],
         "failed": []
     }
 
-# Enable ANSI escape characters in terminal (for Windows)
-try:
-    os.system("")
-except Exception:
-    pass
+# Serializes console output between worker threads
+LOG_LOCK = threading.Lock()
+
+# Protects STATS counters updated from worker threads (list appends are already thread-safe)
+STATS_LOCK = threading.Lock()
+
+# Movie/show items of every Plex library, fetched once per run (see build_plex_index)
+PLEX_INDEX = None
+
+# Children (seasons/episodes) of Plex items, fetched once per run: {(ratingKey, method): [items]}
+PLEX_CHILDREN_CACHE = {}
+PLEX_CHILDREN_CACHE_LOCK = threading.Lock()
+
+# One lock per (ratingKey, method) listing: a single thread downloads it, the others wait for its result
+PLEX_CHILDREN_FETCH_LOCKS = {}
+
+# Same children indexed by number, built once per show: {(ratingKey, method): {index: item}} (see get_plex_child_index)
+PLEX_CHILD_INDEX_CACHE = {}
+
+# One lock per Plex item (ratingKey): NFO files resolved to the same item are applied one at a time
+PLEX_ITEM_LOCKS = {}
+PLEX_ITEM_LOCKS_LOCK = threading.Lock()
+
+# File names of each media directory, listed once for all artwork lookups: {dir_path: {lowercase name: name}}
+DIR_FILE_NAMES = {}
+DIR_FILE_NAMES_LOCK = threading.Lock()
+
+# Fields/tag collections already found missing on a Plex item class: {(class name, rest_field)}
+MISSING_ITEM_FIELDS = set()
+
+# State of each NFO file after its last successful update: {nfo_path: (mtime_ns, size, fields_digest, sync_context)}
+NFO_STATE_CACHE = None # Opened in main() (see open_nfo_state_cache)
 
 # ANSI colors for terminal output (used only for console)
 COLOR = {
@@ -185,42 +299,90 @@ COLOR = {
     "RESET": "\033[0m",
 }
 
-# ------------
-# Plex details
-# ------------
+# Console color of each log level (other levels use orange)
+LEVEL_COLOR = {
+    "DEBUG": COLOR["CYAN"],
+    "INFO": COLOR["BLUE"],
+    "SUCCESS": COLOR["GREEN"],
+    "WARN": COLOR["YELLOW"],
+    "WARNING": COLOR["YELLOW"],
+    "ERROR": COLOR["RED"]
+}
 
-# If not changed in configurations, get value from .env
-if not PLEX_URL:
-    PLEX_URL = os.environ.get("PLEX_URL")
+# Plex connection (set in main(), see connect_to_plex)
+PLEX_SESSION = None
+plex = None
 
-if not PLEX_TOKEN:
-    PLEX_TOKEN = os.environ.get("PLEX_TOKEN")
 
-if not PLEX_URL or not PLEX_TOKEN:
-    print(f"\n{COLOR['RED']}ERROR{COLOR['RESET']}: PLEX_URL and PLEX_TOKEN must be set in a .env file or environment variables.")
-    print("Create a .env with:")
-    print("  PLEX_URL=http://your-plex:32400")
-    print("  PLEX_TOKEN=xxxxxxxxxxxxxxxx")
-    sys.exit(1)
 
-# Remove trailing slash from Plex URL (for consistency)
-PLEX_URL = PLEX_URL.rstrip("/")
 
-# Connect to Plex
-try:
-    plex = PlexServer(PLEX_URL, PLEX_TOKEN)
-    print(f"{COLOR['GREEN']}SUCCESS{COLOR['RESET']}: Connected to Plex at {PLEX_URL}\n")
+#############
+# FUNCTIONS #
+#############
+
+class RateLimiter:
+    # ===========================================================================================
+    # Thread-safe token bucket for Plex write requests: only waits when requests exceed `rate`/s
+    # When Plex reports it is overloaded (429/503), the rate is halved for a cooldown period
+    # ===========================================================================================
+
+    def __init__(self, rate, capacity=None, cooldown=30.0):
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.capacity = float(capacity or max(1.0, self.max_rate))
+        self.tokens = self.capacity
+        self.cooldown = cooldown
+        self.cooldown_until = 0.0
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # Take one token, sleeping only for the missing fraction of a token
+        if self.max_rate <= 0:
+            return
 
-except Exception as e:
-    print(f"{COLOR['RED']}ERROR{COLOR['RESET']}: Failed to connect to Plex at {PLEX_URL}: {e}\n")
-    sys.exit(1)
+        with self.lock:
+            now = time.monotonic()
 
+            # Back to the configured rate once the cooldown is over
+            if self.rate < self.max_rate and now >= self.cooldown_until:
+                self.rate = self.max_rate
 
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
 
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            # The token earned while sleeping is consumed by this request
+            time.sleep((1 - self.tokens) / self.rate)
+            self.tokens = 0.0
+            self.last_refill = time.monotonic()
+
+    def backoff(self):
+        # Halve the rate (down to 1 request every 10s) and drop the burst allowance
+        if self.max_rate <= 0:
+            return
+
+        with self.lock:
+            self.rate = max(self.rate / 2, 0.1)
+            self.tokens = 0.0
+            self.cooldown_until = time.monotonic() + self.cooldown
+
+# Shared limiter for every Plex edit/upload (configured with PLEX_RPS in main())
+PLEX_RATE_LIMITER = RateLimiter(0)
+
+
+def check_plex_throttling(error):
+    # ===========================================================================
+    # Slow down future Plex requests if an error shows that Plex is overloaded
+    # ===========================================================================
+
+    if THROTTLE_STATUS_RE.search(str(error)):
+        PLEX_RATE_LIMITER.backoff()
+        log("WARN", f"Plex is throttling requests, reducing rate to {PLEX_RATE_LIMITER.rate:g} request(s)/s for {PLEX_RATE_LIMITER.cooldown:g}s.")
 
-#############
-# FUNCTIONS #
-#############
 
 def enable_tab_completion():
     # ============================================
@@ -246,31 +408,40 @@ def enable_tab_completion():
     # If we reached here, a readline-like API is available
     import readline
 
+    # readline calls the completer with state 0, 1, 2... for the same text: list the directory only once
+    completion = {"text": None, "matches": []}
+    max_matches = 500
+
     def complete_path(text, state):
-        text_expanded = os.path.expanduser(text)
-        dirname, rest = os.path.split(text_expanded)
+        if state == 0 or completion["text"] != text:
+            text_expanded = os.path.expanduser(text)
+            dirname, rest = os.path.split(text_expanded)
 
-        if dirname == "":
-            dirname = "."
+            if dirname == "":
+                dirname = "."
 
-        try:
-            entries = os.listdir(dirname)
-        except Exception:
-            entries = []
+            rest_lower = rest.lower()
+            matches = []
+
+            # scandir entries know whether they are directories (no stat per entry)
+            try:
+                with os.scandir(dirname) as it:
+                    for entry in it:
+                        if entry.name.lower().startswith(rest_lower):
+                            suffix = os.sep if entry.is_dir() else ""
+                            matches.append(os.path.join(dirname, entry.name) + suffix)
 
-        matches = []
+                            if len(matches) >= max_matches:
+                                break
 
-        for e in entries:
-            if e.lower().startswith(rest.lower()):
-                full = os.path.join(dirname, e)
+            except Exception:
+                matches = []
 
-                if os.path.isdir(full):
-                    matches.append(os.path.join(dirname, e) + os.sep)
-                else:
-                    matches.append(os.path.join(dirname, e))
+            completion["text"] = text
+            completion["matches"] = matches
 
         try:
-            return matches[state]
+            return completion["matches"][state]
 
         except IndexError:
             return None
@@ -292,54 +463,49 @@ def enable_tab_completion():
     except Exception:
         pass
 
-# Enable auto complete TAB
-enable_tab_completion()
 
 
-def log(level, message):
-    # =================================
+def log(level, message, *args):
+    # ===============================================================================
     # Central logging/printing function
-    # =================================
-
-    global DEBUG_MODE
+    # Extra args are %-formatted into the message only if it is actually emitted
+    # ===============================================================================
 
     # Always uppercase
     level = (level or "INFO").upper()
 
-    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    plain_msg = f"{now} [{level}] {message}"
-
-    # Skip debug logs entirely if DEBUG_MODE is off
+    # Skip debug logs entirely if DEBUG_MODE is off (before any timestamp/formatting work)
     if level == "DEBUG" and not DEBUG_MODE:
         return
 
-    # Write to file (plain text)
-    if LOGGING:
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    if args:
+        message = str(message) % args
+
+    # Color selection
+    color = LEVEL_COLOR.get(level, COLOR["ORANGE"])
+
+    # Write to file (plain text, the logging module is thread-safe)
+    levelno = LOG_LEVELS.get(level, logging.INFO)
+
+    if logger.isEnabledFor(levelno):
         try:
-            with open(LOG_FILE, "a", encoding="utf-8") as lf:
-                # write each line separately for long/multiline messages
-                for line in str(message).splitlines() or [str(message)]:
-                    lf.write(f"{now} [{level}] {line}\n")
+            # write each line separately for long/multiline messages
+            for line in str(message).splitlines() or [str(message)]:
+                logger.log(levelno, line, extra={"label": level})
 
         except Exception:
             # don't crash logging
             pass
 
-    # Color selection
-    color = {
-        "DEBUG": COLOR["CYAN"],
-        "INFO": COLOR["BLUE"],
-        "SUCCESS": COLOR["GREEN"],
-        "WARN": COLOR["YELLOW"],
-        "WARNING": COLOR["YELLOW"],
-        "ERROR": COLOR["RED"]
-    }.get(level, COLOR["ORANGE"])
-
-    try:
-        print(f"{now} [{color}{level}{COLOR['RESET']}] {message}")
-    except Exception:
-        # fallback plain print
-        print(plain_msg)
+    # One console writer at a time (log() is called from worker threads)
+    with LOG_LOCK:
+        try:
+            print(f"{now} [{color}{level}{COLOR['RESET']}] {message}")
+        except Exception:
+            # fallback plain print
+            print(f"{now} [{level}] {message}")
 
 
 def prompt_choice(prompt, choices):
@@ -367,6 +533,42 @@ def prompt_choice(prompt, choices):
         print(f"{COLOR['RED']}Invalid{COLOR['RESET']} choice, try again.")
 
 
+def fold_ascii(s):
+    # =================================================================
+    # Accent-insensitive, case-insensitive form of a string ("Amélie" -> "amelie")
+    # =================================================================
+
+    # Pure ASCII: nothing to fold
+    if s.isascii():
+        return s.casefold()
+
+    # Common accented Latin letters: one C-level translate pass
+    s = s.translate(ASCII_FOLD_TABLE)
+    if s.isascii():
+        return s.casefold()
+
+    # Anything else (other scripts, symbols, ligatures): full Unicode decomposition
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+
+    return s.casefold()
+    # =================================================================
+
+
+@lru_cache(maxsize=8192)
+def normalize_title(s):
+    # ==========================================================================
+    # Comparable form of a title: whitespace collapsed, accent and case folded
+    # Memoized: parent/show titles are compared again for every candidate
+    # ==========================================================================
+
+    if s is None:
+        return ""
+
+    # One regex pass (collapse/trim spaces) then one translate/casefold pass
+    return fold_ascii(WHITESPACE_RE.sub(" ", str(s)).strip())
+
+
 def normalize_path(p):
     # =========================================================
     # Return absolute, normalized path without trailing slashes
@@ -394,13 +596,248 @@ def normalize_path(p):
     return p
 
 
+def scan_nfo_dir(dir_path):
+    # =====================================================================================
+    # Read one directory (os.scandir, no per-file stat syscalls)
+    # Returns (sub-directories to visit, .nfo files found); hidden/junk dirs are left out
+    # =====================================================================================
+
+    sub_dirs = []
+    nfo_files = []
+
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                # Symlinked directories are not followed (same as os.walk)
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name.startswith(".") or entry.name in SKIP_SCAN_DIRS:
+                        continue
+
+                    sub_dirs.append(entry.path)
+
+                # Only the last 4 characters need lowering to check the extension
+                elif entry.name[-4:].lower() == ".nfo":
+                    nfo_files.append(entry.path)
+
+    except OSError as e:
+        log("WARN", f"Cannot read directory '{dir_path}': {e}")
+
+    return sub_dirs, nfo_files
+
+
+def iter_nfo_files(root):
+    # ==================================================
+    # Yield the path of every .nfo file below root
+    # ==================================================
+
+    pending_dirs = [root]
+
+    while pending_dirs:
+        sub_dirs, nfo_files = scan_nfo_dir(pending_dirs.pop())
+        pending_dirs.extend(sub_dirs)
+        yield from nfo_files
+
+
+def find_nfo_files(scan_path):
+    # ===================================================================================
+    # Return every .nfo file below scan_path (unsorted)
+    # Each top-level sub-directory is walked by its own worker so directory reads overlap
+    # ===================================================================================
+
+    sub_dirs, nfo_files = scan_nfo_dir(scan_path)
+
+    if not sub_dirs:
+        return nfo_files
+
+    with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(sub_dirs))) as pool:
+        futures = [pool.submit(lambda d: list(iter_nfo_files(d)), d) for d in sub_dirs]
+
+        for future in as_completed(futures):
+            nfo_files.extend(future.result())
+
+    return nfo_files
+
+
+def get_dir_file_names(dir_path):
+    # =====================================================================
+    # Return the names of the files in dir_path (one scandir per directory)
+    # keyed by lowercase name, for case-insensitive lookups: {lower: name}
+    # Cached for the whole run: NFO files of a folder share the same listing
+    # =====================================================================
+
+    names = DIR_FILE_NAMES.get(dir_path)
+    if names is not None:
+        return names
+
+    try:
+        with os.scandir(dir_path) as it:
+            names = {entry.name.lower(): entry.name for entry in it if entry.is_file()}
+
+    except OSError as e:
+        log("DEBUG", "Cannot list directory '%s': %s", dir_path, e)
+        names = {}
+
+    with DIR_FILE_NAMES_LOCK:
+        return DIR_FILE_NAMES.setdefault(dir_path, names)
+
+
+def build_plex_index(plex_server):
+    # ==========================================================================================
+    # Fetch every movie/show library once and index the items by folder path, ratingKey and title
+    # Avoids one Plex search per media folder; paths match because the script runs on the server
+    # ==========================================================================================
+
+    index = {"by_path": {}, "by_rating_key": {}, "by_title": {}, "sections": []}
+    ambiguous_paths = set()
+
+    try:
+        sections = [s for s in plex_server.library.sections() if s.type in ("movie", "show")]
+        index["sections"] = sections
+
+    except Exception as e:
+        log("WARN", f"Could not list Plex libraries, falling back to searches: {e}")
+        return index
+
+    for section in sections:
+        try:
+            items = section.all()
+
+        except Exception as e:
+            log("WARN", f"Could not fetch library '{section.title}', falling back to searches for it: {e}")
+            continue
+
+        for item in items:
+            index["by_rating_key"][item.ratingKey] = item
+            index["by_title"].setdefault(normalize_title(item.title), []).append(item)
+
+            # Shows expose their folder(s); movies expose their media file(s)
+            for location in getattr(item, "locations", None) or []:
+                folder = normalize_path(location if section.type == "show" else os.path.dirname(location))
+                known = index["by_path"].get(folder)
+
+                # Several items in one folder: never guess, let the title search decide
+                if known is not None and known.ratingKey != item.ratingKey:
+                    ambiguous_paths.add(folder)
+
+                index["by_path"][folder] = item
+
+    for folder in ambiguous_paths:
+        del index["by_path"][folder]
+
+    log("DEBUG", "Plex index built: %s items, %s folders (%s libraries).", len(index['by_rating_key']), len(index['by_path']), len(sections))
+    return index
+
+
+def get_plex_children(plex_item, method):
+    # ===========================================================================================
+    # Return plex_item.<method>() (e.g. "seasons", "episodes"), fetched once per item
+    # Every NFO file of a show that falls back to a search shares the same child listing
+    # Worker threads missing the cache together wait for one download instead of each fetching it
+    # ===========================================================================================
+
+    key = (plex_item.ratingKey, method)
+    children = PLEX_CHILDREN_CACHE.get(key)
+
+    if children is not None:
+        return children
+
+    with PLEX_CHILDREN_CACHE_LOCK:
+        fetch_lock = PLEX_CHILDREN_FETCH_LOCKS.setdefault(key, threading.Lock())
+
+    with fetch_lock:
+        # Another thread may have fetched it while this one was waiting
+        children = PLEX_CHILDREN_CACHE.get(key)
+
+        if children is None:
+            children = list(getattr(plex_item, method)())
+
+            with PLEX_CHILDREN_CACHE_LOCK:
+                PLEX_CHILDREN_CACHE[key] = children
+
+    return children
+
+
+def get_plex_child_index(plex_item, method):
+    # =========================================================================================
+    # Return the children of a show by number, built once per show from get_plex_children
+    # "seasons": {season number: season}, "episodes": {(season number, episode number): episode}
+    # =========================================================================================
+
+    key = (plex_item.ratingKey, method)
+    index = PLEX_CHILD_INDEX_CACHE.get(key)
+
+    if index is None:
+        if method == "episodes":
+            index = {(child.parentIndex, child.index): child for child in get_plex_children(plex_item, method)}
+        else:
+            index = {child.index: child for child in get_plex_children(plex_item, method)}
+
+        with PLEX_CHILDREN_CACHE_LOCK:
+            index = PLEX_CHILD_INDEX_CACHE.setdefault(key, index)
+
+    return index
+
+
+def get_plex_item_lock(plex_item):
+    # ==========================================================================================
+    # Return the lock of a Plex item, shared by every NFO file resolved to it
+    # plexapi edits (batchEdits/editField/editTags/saveEdits/reload) mutate the item unguarded
+    # ==========================================================================================
+
+    key = getattr(plex_item, "ratingKey", None) or id(plex_item)
+
+    with PLEX_ITEM_LOCKS_LOCK:
+        return PLEX_ITEM_LOCKS.setdefault(key, threading.Lock())
+
+
+def find_plex_item_by_ids(nfo_ids, media_type, nfo_dir):
+    # =====================================================================================
+    # Find a movie/show by the external IDs of its NFO file (imdb://, tmdb://, tvdb://)
+    # Only an item stored in the NFO's folder is returned: the same film can be in several
+    # libraries (e.g. HD and 4K) and each NFO must update its own copy
+    # Returns None when no library of that type has the IDs for that folder
+    # =====================================================================================
+
+    sections = [s for s in (PLEX_INDEX["sections"] if PLEX_INDEX else []) if s.type == media_type]
+    folder = normalize_path(nfo_dir)
+
+    for id_type in NFO_ID_TYPES:
+        id_value = nfo_ids.get(id_type)
+        if not id_value:
+            continue
+
+        guid = f"{id_type}://{id_value}"
+
+        for section in sections:
+            try:
+                plex_item = section.getGuid(guid)
+
+            except NotFound:
+                continue
+
+            except Exception as e:
+                log("DEBUG", "Lookup of '%s' failed in library '%s': %s", guid, section.title, e)
+                continue
+
+            # Shows expose their folder(s); movies expose their media file(s)
+            locations = getattr(plex_item, "locations", None) or []
+            item_folders = {normalize_path(loc if media_type == "show" else os.path.dirname(loc)) for loc in locations}
+
+            if folder not in item_folders:
+                log("DEBUG", "'%s' is '%s' in library '%s', but not stored in '%s'. Ignored.", guid, plex_item.title, section.title, nfo_dir)
+                continue
+
+            log("INFO", f"Matched '{guid}' to Plex {media_type} '{plex_item.title}' in library '{section.title}'.")
+            return plex_item
+
+    return None
+
+
 def resolve_plex_item(media_title, media_type, automatic_mode, parent_plex_item=None):
     # ============================================================================================
     # Resolves the correct Plex item (movie, show, season, episode, etc.) for a given media title
     # ============================================================================================
 
-    global STATS
-
     plex_item = None
 
     # ----------------------------
@@ -408,7 +845,13 @@ def resolve_plex_item(media_title, media_type, automatic_mode, parent_plex_item=
     # ----------------------------
     results = search_plex_for_media_by_title(media_title, media_type, parent_plex_item)
 
-    if not results["candidates"]:
+    candidates = results["candidates"]
+    best_match = results["best_match"]
+    best_score = results["best_score"]
+    is_confident = results["is_confident"]
+    nb_excellent_match = results["nb_excellent_match"]
+
+    if not candidates:
         log("WARN", f"No candidate found for '{media_title}'")
         STATS["skipped"].append(f"{media_title}: No candidate found.")
         return None
@@ -417,44 +860,44 @@ def resolve_plex_item(media_title, media_type, automatic_mode, parent_plex_item=
     # Automatic (non-interactive) mode
     # --------------------------------
     if automatic_mode:
-        if results["is_confident"] and results["nb_excellent_match"] == 1:
+        if is_confident and nb_excellent_match == 1:
             # Confident single excellent match → safe auto-select
-            plex_item = results["best_match"]
-            log("INFO", f"Automatically matched '{media_title}' (confident single match, score={results['best_score']}).")
+            plex_item = best_match
+            log("INFO", f"Automatically matched '{media_title}' (confident single match, score={best_score}).")
 
-        elif results["nb_excellent_match"] > 1:
+        elif nb_excellent_match > 1:
             # Multiple excellent matches → skip for safety
-            log("WARN", f"Automatic mode: Multiple excellent matches found for '{media_title}' ({results['nb_excellent_match']} matches ≥99). Skipping.")
+            log("WARN", f"Automatic mode: Multiple excellent matches found for '{media_title}' ({nb_excellent_match} matches ≥99). Skipping.")
 
         else:
             # No confident match → skip for safety
-            log("WARN", f"Automatic mode: No confident match for '{media_title}' (best score={results['best_score']}). Skipping.")
+            log("WARN", f"Automatic mode: No confident match for '{media_title}' (best score={best_score}). Skipping.")
 
     # -------------------------
     # Manual / interactive mode
     # -------------------------
     else:
-        if results["is_confident"] and results["nb_excellent_match"] == 1:
+        if is_confident and nb_excellent_match == 1:
             # Confident single match — auto-accept
-            plex_item = results["best_match"]
+            plex_item = best_match
             log("INFO", f"Automatically matched '{media_title}' (single confident match).")
 
-        elif results["nb_excellent_match"] > 1:
+        elif nb_excellent_match > 1:
             # Multiple excellent matches: prompt user
-            log("WARN", f"Multiple excellent matches found for '{media_title}' ({results['nb_excellent_match']} matches).") # Score >= 99
-            plex_item = choose_plex_item(results["candidates"][:results["nb_excellent_match"]], media_title)
+            log("WARN", f"Multiple excellent matches found for '{media_title}' ({nb_excellent_match} matches).") # Score >= 99
+            plex_item = choose_plex_item(candidates[:nb_excellent_match], media_title)
             if not plex_item:
                 STATS["skipped"].append(f"{media_title}: User did not select any match.")
 
-        elif len(results["nb_excellent_match"]) == 1:
+        elif len(candidates) == 1:
             # Only one total candidate: accept it interactively
-            plex_item = results["candidates"][0]
+            plex_item = candidates[0]
             log("INFO", f"Accepted single candidate for '{media_title}' (manual mode).")
 
         else:
             # Multiple uncertain matches — prompt user
             log("INFO", f"No confident match for '{media_title}'. Prompting user selection.")
-            plex_item = choose_plex_item(results["candidates"], media_title)
+            plex_item = choose_plex_item(candidates, media_title)
             if not plex_item:
                 STATS["skipped"].append(f"{media_title}: No confident match and user did not select any match.")
 
@@ -462,13 +905,94 @@ def resolve_plex_item(media_title, media_type, automatic_mode, parent_plex_item=
     # Safety net
     # ----------
     if not plex_item:
-        log("DEBUG", f"No item assigned for '{media_title}'.")
+        log("DEBUG", "No item assigned for '%s'.", media_title)
 
     return plex_item
 
 
 
 
+def is_child_of_plex_parent(candidate, parent_rk, parent_title_norm):
+    # ==========================================================================================
+    # Tell if a Plex candidate belongs to the searched parent
+    # parent_rk: parent ratingKey as a string, or None when the parent is only known by its title
+    # ==========================================================================================
+
+    try:
+        if parent_rk is not None:
+            # Compare candidate parent/grandparent keys
+            cand_parent_rk = getattr(candidate, 'parentRatingKey', None)
+            if cand_parent_rk and str(cand_parent_rk) == parent_rk:
+                return True
+
+            cand_grandparent_rk = getattr(candidate, 'grandparentRatingKey', None)
+            if cand_grandparent_rk and str(cand_grandparent_rk) == parent_rk:
+                return True
+
+            # Check for parent key substring inside candidate key path
+            cand_key = getattr(candidate, 'key', None)
+            if cand_key and parent_rk in str(cand_key):
+                return True
+
+            # Compare normalized parent titles
+            cand_parent_title = getattr(candidate, 'parentTitle', None)
+            if cand_parent_title and normalize_title(cand_parent_title) == parent_title_norm:
+                return True
+        else:
+            cand_parent_title = getattr(candidate, 'parentTitle', None)
+            if cand_parent_title and normalize_title(cand_parent_title) == parent_title_norm:
+                return True
+
+            cand_grandparent_title = getattr(candidate, 'grandparentTitle', None)
+            if cand_grandparent_title and normalize_title(cand_grandparent_title) == parent_title_norm:
+                return True
+
+        return False
+
+    except Exception:
+        return False
+
+
+def score_plex_candidate(cand, idx, norm_search, year, parent_rk, parent_title_norm):
+    # =====================================================================================
+    # Score one Plex candidate against the searched title (see search_plex_for_media_by_title)
+    # Returns (score, idx, cand); candidates of another type are filtered out beforehand
+    # =====================================================================================
+
+    try:
+        cand_title = getattr(cand, 'title', None) or getattr(cand, 'name', None) or ""
+        norm_cand_title = normalize_title(cand_title)
+        cand_year = getattr(cand, 'year', None)
+        cand_year_int = int(cand_year) if cand_year else None
+
+        score = 0
+
+        # Exact title match
+        if norm_cand_title == norm_search:
+            score = 99
+
+            if year and cand_year_int == year:
+                score = 100
+
+        elif norm_search in norm_cand_title:
+            score = 20
+
+            if norm_cand_title.startswith(norm_search):
+                score += 5
+
+        if NOISE_KEYWORDS_RE.search(cand_title):
+            score = max(score - 50, 1)
+
+        if parent_title_norm is not None and is_child_of_plex_parent(cand, parent_rk, parent_title_norm):
+            score += 30
+
+        return (max(0, score), idx, cand)
+
+    except Exception as exc:
+        log("DEBUG", "Error scoring candidate %s: %s", getattr(cand, 'title', str(cand)), exc)
+        return (0, idx, cand)
+
+
 def search_plex_for_media_by_title(media_title, media_type=None, parent_plex_item=None):
     # ================================================================================
     # Search Plex for a media item by title (and optionally media type or parent item)
@@ -494,79 +1018,34 @@ def search_plex_for_media_by_title(media_title, media_type=None, parent_plex_ite
     # Extract trailing year if present (e.g. 1999, (1999), - 1999)
     # ------------------------------------------------------------
     year = None
-    match = re.search(r'\s*[\-\(\[\{]\s*\d{4}[\)\]\}]?$', media_title_raw)
+    match = TRAILING_YEAR_RE.search(media_title_raw)
     if match:
-        matched_str = match.group(0)
-        year_match = re.search(r'\d+', matched_str)
-        year = int(year_match.group(0)) if year_match else None
-        media_title_raw = re.sub(re.escape(matched_str) + r'$', '', media_title_raw).strip()
-
-
-    def _normalize(s):
-        # ========================================================
-        # Normalization helper (Unicode-aware, accent-insensitive)
-        # ========================================================
-
-        if s is None:
-            return ""
-
-        s = str(s).strip()
-        s = unicodedata.normalize("NFKD", s)
-        s = "".join(ch for ch in s if not unicodedata.combining(ch))
-
-        return s.casefold()
-        # ========================================================
-
-
-    norm_search = _normalize(media_title_raw)
+        year = int(match.group(1))
+        media_title_raw = media_title_raw[:match.start()].strip()
 
-    # --------------------------------------------------------------
-    # Helper to determine if a candidate belongs to the given parent
-    # --------------------------------------------------------------
-    def _is_child_of_parent(candidate, parent_obj):
-        try:
-            if hasattr(parent_obj, 'ratingKey'):
-                parent_rk = getattr(parent_obj, 'ratingKey')
-
-                # Compare candidate parent/grandparent keys
-                if getattr(candidate, 'parentRatingKey', None) and str(getattr(candidate, 'parentRatingKey')) == str(parent_rk):
-                    return True
-
-                if getattr(candidate, 'grandparentRatingKey', None) and str(getattr(candidate, 'grandparentRatingKey')) == str(parent_rk):
-                    return True
-
-                # Check for parent key substring inside candidate key path
-                cand_key = getattr(candidate, 'key', None)
-                if cand_key and str(parent_rk) in str(cand_key):
-                    return True
-
-                # Compare normalized parent titles
-                if getattr(candidate, 'parentTitle', None) and _normalize(getattr(candidate, 'parentTitle')) == _normalize(getattr(parent_obj, 'title', '')):
-                    return True
-            else:
-                parent_str = str(parent_obj)
-                if getattr(candidate, 'parentTitle', None) and _normalize(getattr(candidate, 'parentTitle')) == _normalize(parent_str):
-                    return True
-
-                if getattr(candidate, 'grandparentTitle', None) and _normalize(getattr(candidate, 'grandparentTitle')) == _normalize(parent_str):
-                    return True
-
-            return False
-
-        except Exception:
-            return False
+    norm_search = normalize_title(media_title_raw)
 
-    # ---------------------------------------------------
-    # If parent item itself matches the search title/year
-    # ---------------------------------------------------
+    # ---------------------------------------------------------------------------------------------
+    # Parent identity computed once, compared against every candidate (see is_child_of_plex_parent)
+    # If parent item itself matches the search title/year, return it right away
+    # ---------------------------------------------------------------------------------------------
     parent = parent_plex_item or None
+    parent_rk = None
+    parent_title_norm = None
+
     if parent:
+        if hasattr(parent, 'ratingKey'):
+            parent_rk = str(parent.ratingKey)
+            parent_title_norm = normalize_title(getattr(parent, 'title', ''))
+        else:
+            parent_title_norm = normalize_title(str(parent))
+
         try:
             parent_title = getattr(parent, 'title', None)
             parent_year = getattr(parent, 'year', None)
 
-            if _normalize(parent_title) == norm_search and (year is None or str(parent_year) == str(year)):
-                log("DEBUG", f"{function_name}: Parent itself '{parent_title}' matches search query '{media_title_raw}'.")
+            if normalize_title(parent_title) == norm_search and (year is None or str(parent_year) == str(year)):
+                log("DEBUG", "%s: Parent itself '%s' matches search query '%s'.", function_name, parent_title, media_title_raw)
                 return {
                     "candidates": [parent],
                     "best_match": parent,
@@ -576,7 +1055,7 @@ def search_plex_for_media_by_title(media_title, media_type=None, parent_plex_ite
                 }
 
         except Exception as exc:
-            log("DEBUG", f"{function_name}: Error evaluating parent self-match: {exc}")
+            log("DEBUG", "%s: Error evaluating parent self-match: %s", function_name, exc)
 
     # ---------------------------------
     # Collect candidate items from Plex
@@ -586,30 +1065,39 @@ def search_plex_for_media_by_title(media_title, media_type=None, parent_plex_ite
     if parent:
         try:
             if media_type == 'season' and hasattr(parent, 'seasons'):
-                scoped_candidates.extend(parent.seasons())
+                scoped_candidates.extend(get_plex_children(parent, 'seasons'))
 
             elif media_type == 'episode':
                 if hasattr(parent, 'episodes'):
-                    scoped_candidates.extend(parent.episodes())
+                    scoped_candidates.extend(get_plex_children(parent, 'episodes'))
 
                 elif hasattr(parent, 'seasons'):
-                    for s in parent.seasons():
+                    for s in get_plex_children(parent, 'seasons'):
                         try:
                             if hasattr(s, 'episodes'):
-                                scoped_candidates.extend(list(s.episodes()))
+                                scoped_candidates.extend(get_plex_children(s, 'episodes'))
                             else:
                                 scoped_candidates.extend(getattr(s, 'children', []) or [])
 
                         except Exception:
                             continue
         except Exception as exc:
-            log("DEBUG", f"{function_name}: Scoped candidate collection failed: {exc}")
+            log("DEBUG", "%s: Scoped candidate collection failed: %s", function_name, exc)
             scoped_candidates = []
 
+    # Exact (normalized) title hits among the movies/shows prefetched by build_plex_index
+    indexed_candidates = []
+    if PLEX_INDEX and media_type in ("movie", "show"):
+        indexed_candidates = PLEX_INDEX["by_title"].get(norm_search, [])
+
     if scoped_candidates:
-        log("DEBUG", f"Using {len(scoped_candidates)} scoped candidates under parent for '{media_title_raw}'")
+        log("DEBUG", "Using %s scoped candidates under parent for '%s'", len(scoped_candidates), media_title_raw)
         candidates_to_score = scoped_candidates
 
+    elif indexed_candidates:
+        log("DEBUG", "Using %s indexed candidates for '%s'", len(indexed_candidates), media_title_raw)
+        candidates_to_score = indexed_candidates
+
     else:
         # No parent or scoped data — perform Plex search
         try:
@@ -628,51 +1116,17 @@ def search_plex_for_media_by_title(media_title, media_type=None, parent_plex_ite
     # -------------------------------------------------------
     # Score candidates based on title, year, and relationship
     # -------------------------------------------------------
-    scored = []
-    noise_keywords = ('sample', 'trailer', 'teaser', 'promo', 'deleted scene', 'behind the scenes')
-
-    for idx, cand in enumerate(candidates_to_score):
-        try:
-            cand_type = getattr(cand, 'type', None)
-            if media_type and cand_type and media_type != cand_type:
-                continue
-
-            cand_title = getattr(cand, 'title', None) or getattr(cand, 'name', None) or ""
-            norm_cand_title = _normalize(cand_title)
-            cand_year = getattr(cand, 'year', None)
-            cand_year_int = int(cand_year) if cand_year else None
-
-            score = 0
+    # Leave out candidates of another type first (items without a type are kept)
+    if media_type:
+        candidates_to_score = [cand for cand in candidates_to_score if getattr(cand, 'type', None) in (None, "", media_type)]
 
-            # Exact title match
-            if norm_cand_title == norm_search:
-                score = 99
-
-                if year and cand_year_int == year:
-                    score = 100
-
-            elif norm_search in norm_cand_title:
-                score = 20
-
-                if cand_title.lower().startswith(media_title_raw.lower()):
-                    score += 5
-
-            lower_cand_title = cand_title.lower()
-            if any(k in lower_cand_title for k in noise_keywords):
-                score = max(score - 50, 1)
-
-            if parent and _is_child_of_parent(cand, parent):
-                score += 30
-
-            score = max(0, score)
-            scored.append((score, idx, cand, norm_cand_title, cand_year_int))
-
-        except Exception as exc:
-            log("DEBUG", f"Error scoring candidate {getattr(cand, 'title', str(cand))}: {exc}")
-            scored.append((0, idx, cand, _normalize(getattr(cand, 'title', None)), None))
+    scored = [
+        score_plex_candidate(cand, idx, norm_search, year, parent_rk, parent_title_norm)
+        for idx, cand in enumerate(candidates_to_score)
+    ]
 
     if not scored:
-        log("DEBUG", f"{function_name}('{media_title_raw}') returned no candidates after filtering.")
+        log("DEBUG", "%s('%s') returned no candidates after filtering.", function_name, media_title_raw)
         return {
             "candidates": [],
             "best_match": None,
@@ -684,31 +1138,39 @@ def search_plex_for_media_by_title(media_title, media_type=None, parent_plex_ite
     # ------------------------------
     # Sort and apply selection rules
     # ------------------------------
-    scored.sort(key=lambda x: (-x[0], x[1]))  # Sort by descending score, stable order by index
+    sort_key = lambda x: (-x[0], x[1])  # Descending score, stable order by index
 
-    # Determine best match and excellent matches
-    best_score, _, best_match, _, _ = scored[0]
+    # Determine best match and excellent matches in linear passes (no full sort needed)
+    best_score, _, best_match = min(scored, key=sort_key)
 
-    excellent_matches = [cand for score, _, cand, _, _ in scored if score >= 99]
+    excellent_matches = sorted((entry for entry in scored if entry[0] >= 99), key=sort_key)
 
     nb_excellent_match = len(excellent_matches)
 
     is_confident_match = best_score >= 99
 
+    # Only the excellent matches are ever offered when there are some: other candidates keep their order
+    # Without any, every candidate may be shown to the user, best first
+    if excellent_matches:
+        ordered = excellent_matches + [entry for entry in scored if entry[0] < 99]
+
+    else:
+        ordered = sorted(scored, key=sort_key)
+
     if nb_excellent_match > 1:
-        log("DEBUG", f"{function_name}: Found {nb_excellent_match} excellent matches (score ≥99) for '{media_title_raw}'.")
+        log("DEBUG", "%s: Found %s excellent matches (score ≥99) for '%s'.", function_name, nb_excellent_match, media_title_raw)
 
     elif is_confident_match:
-        log("DEBUG", f"{function_name}: Confident single match found '{getattr(best_match, 'title', best_match)}' with score {best_score}.")
+        log("DEBUG", "%s: Confident single match found '%s' with score %s.", function_name, getattr(best_match, 'title', best_match), best_score)
 
     else:
-        log("DEBUG", f"{function_name}: Returning {len(scored)} candidates (no confident match).")
+        log("DEBUG", "%s: Returning %s candidates (no confident match).", function_name, len(scored))
 
     # ------------------------------------------
     # Return structured dictionary with metadata
     # ------------------------------------------
     return {
-        "candidates": [cand for _, _, cand, _, _ in scored],
+        "candidates": [cand for _, _, cand in ordered],
         "best_match": best_match,
         "best_score": best_score,
         "is_confident": is_confident_match,
@@ -763,56 +1225,284 @@ def parse_nfo_to_dict(nfo_path: str) -> dict:
         log("WARN", f"NFO file not found: {nfo_path}")
         return data
 
-    # Parse XML safely
-    tree = ET.parse(nfo_path)
-    root = tree.getroot()
-
     def element_to_value(elem):
-        # Recursively convert an XML element to dict/list/str
-        children = list(elem)
+        # Convert an XML element to dict/list/str, walking nested elements with an explicit stack
+        # Comments and processing instructions (kept by lxml) have a non-string tag
+        children = [child for child in elem if isinstance(child.tag, str)]
 
         if not children:
             return elem.text.strip() if elem.text else None
 
-        result = {}
-        for child in children:
-            tag = child.tag.lower()
-            value = element_to_value(child)
+        top_result = {}
+        pending = [(iter(children), top_result)]
 
-            # Handle multiple same tags (e.g., multiple <actor>)
-            if tag in result:
-                if not isinstance(result[tag], list):
-                    result[tag] = [result[tag]]
+        while pending:
+            siblings, result = pending[-1]
 
-                result[tag].append(value)
-            else:
-                result[tag] = value
+            for child in siblings:
+                tag = child.tag.lower()
+                grand_children = [c for c in child if isinstance(c.tag, str)]
 
-        return result
+                # Nested element: its (still empty) dict is filled when its children are visited
+                value = {} if grand_children else (child.text.strip() if child.text else None)
 
-    # Flatten one level - make all root children peers in dict
-    for child in root:
-        tag = child.tag.lower()
-        value = element_to_value(child)
-
-        # Handle multiple entries of the same tag
-        if tag in data:
-            if not isinstance(data[tag], list):
-                data[tag] = [data[tag]]
-            data[tag].append(value)
-        else:
-            data[tag] = value
+                # Handle multiple same tags (e.g., multiple <actor>)
+                if tag in result:
+                    if not isinstance(result[tag], list):
+                        result[tag] = [result[tag]]
 
-    # Include the root tag (like <tvshow> or <episodedetails>)
-    data["root_tag"] = root.tag.lower()
+                    result[tag].append(value)
+                else:
+                    result[tag] = value
 
-    # Ensure title exists
-    data.setdefault("title", "")
+                if grand_children:
+                    pending.append((iter(grand_children), value))
+                    break
 
-    return data
+            else:
+                # Every child of this level has been converted
+                pending.pop()
 
+        return top_result
 
-def get_media_type_from_nfo(nfo_data: dict) -> str:
+    # Flatten one level - make all root children peers in dict
+    # The file is streamed: each root child is converted as soon as it is complete, then released
+    root = None
+    depth = 0
+    ids = {}
+
+    try:
+        with open(nfo_path, "rb") as fh:
+            for event, elem in ET.iterparse(fh, events=("start", "end"), **NFO_ITERPARSE_KWARGS):
+                if event == "start":
+                    if root is None:
+                        root = elem
+
+                    depth += 1
+                    continue
+
+                depth -= 1
+
+                # Deeper elements are converted with their root child; skip the root itself too
+                if depth != 1 or not isinstance(elem.tag, str):
+                    continue
+
+                tag = elem.tag.lower()
+                value = element_to_value(elem)
+
+                # External IDs: <uniqueid type="imdb">tt0133093</uniqueid>, <imdbid>, <tmdbid>, <tvdbid>
+                if isinstance(value, str):
+                    if tag == "uniqueid":
+                        id_type = (elem.get("type") or "").lower()
+                    else:
+                        id_type = tag[:-2] if tag.endswith("id") else None
+
+                    if id_type in NFO_ID_TYPES:
+                        ids.setdefault(id_type, value)
+
+                # Handle multiple entries of the same tag
+                if tag in data:
+                    if not isinstance(data[tag], list):
+                        data[tag] = [data[tag]]
+                    data[tag].append(value)
+                else:
+                    data[tag] = value
+
+                # Release the element (and, with lxml, the already processed siblings)
+                elem.clear()
+                if LXML_AVAILABLE:
+                    while elem.getprevious() is not None:
+                        del root[0]
+
+    # lxml recovers from most errors, stdlib ET raises ParseError
+    except Exception as e:
+        log("ERROR", f"Failed to parse NFO file '{nfo_path}': {e}")
+        return {}
+
+    if root is None:
+        log("WARN", f"NFO file has no usable XML content: {nfo_path}")
+        return {}
+
+    # Include the root tag (like <tvshow> or <episodedetails>)
+    data["root_tag"] = root.tag.lower()
+
+    # External IDs found in the NFO ({"imdb": ..., "tmdb": ..., "tvdb": ...})
+    if ids:
+        data["_ids"] = ids
+
+    # Ensure title exists
+    data.setdefault("title", "")
+
+    return data
+
+
+def nfo_may_have_title(nfo_path, head_size=8192):
+    # ==============================================================================
+    # Cheap byte-level check run before the full XML parse of an NFO file
+    # Returns False only when the whole file was read and has no non-empty <title>
+    # ==============================================================================
+
+    try:
+        with open(nfo_path, "rb") as f:
+            head = f.read(head_size + 1)
+
+    except OSError:
+        # Let the full parser report the problem
+        return True
+
+    # UTF-16 NFOs cannot be matched byte-wise
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return True
+
+    if NFO_TITLE_BYTES_RE.search(head):
+        return True
+
+    # Title not in the first bytes of a bigger file: it may still come later
+    return len(head) > head_size
+
+
+def get_nfo_file_state(nfo_path):
+    # ===================================================================
+    # Return (mtime_ns, size) of an NFO file, or None if it cannot be read
+    # ===================================================================
+
+    try:
+        st = os.stat(nfo_path)
+
+    except OSError:
+        return None
+
+    return (st.st_mtime_ns, st.st_size)
+
+
+def get_nfo_digest(nfo_data: dict) -> str:
+    # ===========================================================
+    # Hash of the parsed NFO content (ignores formatting changes)
+    # ===========================================================
+
+    return hashlib.sha1(repr(sorted(nfo_data.items())).encode("utf-8")).hexdigest()
+
+
+def get_nfo_sync_context(nfo_path):
+    # ===================================================================================
+    # Everything besides the NFO content that decides what a run applies to Plex:
+    # (ALLOW_UNLOCK, ALLOW_ART_UPDATE, ((name, mtime_ns, size) of each artwork file, ...))
+    # Artwork files are the ones uploaded for this NFO (same name, ALLOW_ART_EXT)
+    # ===================================================================================
+
+    art_state = []
+
+    if ALLOW_ART_UPDATE:
+        dir_path, base_name = os.path.split(nfo_path)
+        dot = base_name.rfind(".")
+        lower_stem = (base_name[:dot] if dot > 0 else base_name).lower()
+        dir_file_names = get_dir_file_names(dir_path)
+
+        for ext in sorted(ALLOW_ART_EXT_NORMALIZED):
+            art_name = dir_file_names.get(f"{lower_stem}.{ext}")
+
+            if not art_name:
+                continue
+
+            try:
+                st = os.stat(os.path.join(dir_path, art_name))
+
+            except OSError:
+                continue
+
+            art_state.append((art_name, st.st_mtime_ns, st.st_size))
+
+    return (ALLOW_UNLOCK, ALLOW_ART_UPDATE, tuple(art_state))
+
+
+def is_nfo_unchanged(nfo_path, file_state, nfo_digest=None, sync_context=None):
+    # =====================================================================================
+    # Check an NFO file against its state after the last successful update
+    # Off with --force and --always-update-art; the options and artwork files must match too
+    # Without a digest, only mtime/size are compared (no parsing needed)
+    # =====================================================================================
+
+    if FORCE_UPDATE or ALWAYS_UPDATE_ART or NFO_STATE_CACHE is None or file_state is None:
+        return False
+
+    cached = NFO_STATE_CACHE.get(normalize_path(nfo_path))
+
+    # States saved before the sync context was stored are treated as changed
+    if not cached or len(cached) < 4:
+        return False
+
+    if cached[3] != (sync_context or get_nfo_sync_context(nfo_path)):
+        return False
+
+    if nfo_digest is None:
+        return tuple(cached[:2]) == file_state
+
+    return cached[2] == nfo_digest
+
+
+def nfo_art_changed(nfo_path, sync_context):
+    # ==========================================================================
+    # True when the artwork files of an NFO changed since its last saved state
+    # (new, replaced or removed file); False if the NFO has no saved state yet
+    # ==========================================================================
+
+    if NFO_STATE_CACHE is None:
+        return False
+
+    cached = NFO_STATE_CACHE.get(normalize_path(nfo_path))
+
+    return bool(cached) and len(cached) >= 4 and cached[3][2] != sync_context[2]
+
+
+def remember_nfo_state(nfo_path, file_state, nfo_digest, sync_context):
+    # ========================================================================
+    # Save the state of an NFO file whose content is now applied to Plex
+    # ========================================================================
+
+    if NFO_STATE_CACHE is None or DRY_RUN or file_state is None:
+        return
+
+    try:
+        NFO_STATE_CACHE.set(normalize_path(nfo_path), (*file_state, nfo_digest, sync_context))
+
+    except Exception as e:
+        log("DEBUG", "Could not save cache state for '%s': %s", nfo_path, e)
+
+
+def load_nfo_data(nfo_path, file_state):
+    # =======================================================================================================
+    # parse_nfo_to_dict() through the cache: reuse the parsed content while mtime/size match
+    # Stored next to the NFO states under ("parsed", NFO_PARSER_VERSION, path) keys; --force always re-parses
+    # Returns None without parsing when the NFO has no title at all (see nfo_may_have_title)
+    # =======================================================================================================
+
+    cache_key = ("parsed", NFO_PARSER_VERSION, normalize_path(nfo_path))
+
+    # Cache first: a hit needs no read of the NFO file at all
+    if NFO_STATE_CACHE is not None and file_state is not None and not FORCE_UPDATE:
+        cached = NFO_STATE_CACHE.get(cache_key)
+
+        if cached and tuple(cached[:2]) == file_state:
+            return cached[2]
+
+    # No title at all (e.g. a bare IMDb link NFO): skip without parsing the XML
+    if not nfo_may_have_title(nfo_path):
+        return None
+
+    nfo_data = parse_nfo_to_dict(nfo_path)
+
+    # Failed/empty parses are not stored so their error is reported again next run
+    if nfo_data and NFO_STATE_CACHE is not None and file_state is not None:
+        try:
+            NFO_STATE_CACHE.set(cache_key, (*file_state, nfo_data))
+
+        except Exception as e:
+            log("DEBUG", "Could not save parsed content of '%s': %s", nfo_path, e)
+
+    return nfo_data
+
+
+def get_media_type_from_nfo(nfo_data: dict) -> str:
     # ==================================================================================
     # Return media type ('movie', 'show', 'season', 'episode') based on the NFO root tag
     # ==================================================================================
@@ -834,16 +1524,62 @@ def get_media_type_from_nfo(nfo_data: dict) -> str:
 
 
 
-def update_plex_item_fields(plex_item, nfo_data, nfo_file=None):
+def append_clean_tag(tags, name):
+    # =====================================================
+    # Add a cleaned tag name to tags if valid and non-empty
+    # =====================================================
+
+    if not name:
+        return
+
+    clean = str(name).strip()
+    if clean:
+        tags.append(clean)
+
+
+
+def apply_tag_op(plex_item, op, item_title):
     # =======================================================================
-    # Update a Plex item's metadata (show, season, or episode) using NFO data
+    # Queue the editTags calls of one planned tag op (inside batchEdits)
+    # The tags to remove/add are computed while planning (see "remove"/"add")
     # =======================================================================
 
-    global SUPPORTED_FIELD_MAP, ALLOW_UNLOCK, DRY_RUN, CUSTOM_DELAY, STATS, log, time, re, ALWAYS_UPDATE_ART
+    rest_field = op["rest_field"]  # plural collection name
+    tags_to_remove = op["remove"]
+    tags_to_add = op["add"]
+
+    # Remove tags no longer in the NFO in small batches (replace mode only)
+    for i in range(0, len(tags_to_remove), MAX_TAG_BATCH):
+        plex_item.editTags(
+            tag=rest_field,
+            items=tags_to_remove[i:i+MAX_TAG_BATCH],
+            remove=True,
+            locked=True,
+        )
+
+    # Add missing tags in safe chunks
+    for i in range(0, len(tags_to_add), MAX_TAG_BATCH):
+        plex_item.editTags(
+            tag=rest_field,
+            items=tags_to_add[i:i+MAX_TAG_BATCH],
+            remove=False,
+            locked=True,
+        )
+
+    log("DEBUG", "%s: Queued '%s' tags (%d removed, %d added, %d total).", item_title, rest_field, len(tags_to_remove), len(tags_to_add), len(op["new"]))
+
+
+
+def update_plex_item_fields(plex_item, nfo_data, nfo_file=None, art_changed=False):
+    # ==============================================================================================================
+    # Update a Plex item's metadata (show, season, or episode) using NFO data
+    # art_changed: artwork files next to the NFO changed since the last run (uploaded even without metadata changes)
+    # Returns True when the Plex metadata and artwork match the NFO afterwards (updated or unchanged)
+    # ==============================================================================================================
 
     item_title = getattr(plex_item, "title", "Unknown Item")
     item_type = getattr(plex_item, "type", "Unknown Type")
-    log("DEBUG", f"Starting metadata analysis for '{item_title}' ({item_type})")
+    log("DEBUG", "Starting metadata analysis for '%s' (%s)", item_title, item_type)
 
     # Flag to indicate whether edits were successfully applied (used to decide artwork uploads)
     edits_applied = False
@@ -855,72 +1591,52 @@ def update_plex_item_fields(plex_item, nfo_data, nfo_file=None):
         # Determine which fields/tags need updating
         # -----------------------------------------
         for nfo_key, nfo_value in nfo_data.items():
-            if nfo_key not in SUPPORTED_FIELD_MAP:
-                log("DEBUG", f"{item_title}: Unsupported NFO field '{nfo_key}', skipping.")
+            field_info = SUPPORTED_FIELD_LOOKUP.get(nfo_key)
+            if field_info is None:
+                log("DEBUG", "%s: Unsupported NFO field '%s', skipping.", item_title, nfo_key)
                 continue
 
             if nfo_value is None or (isinstance(nfo_value, (str, list, dict)) and not nfo_value):
                 continue
 
-            field_info = SUPPORTED_FIELD_MAP[nfo_key]
-            rest_field = field_info["rest_field"]
-            is_tag = field_info["is_tag"]
+            rest_field, is_tag = field_info
 
             # TAG FIELD HANDLING (genres, directors, actors, etc.)
             if is_tag:
                 tag_names = []
 
-                def add_tag(name):
-                    # =============================================
-                    # Add a cleaned tag name if valid and non-empty
-                    # =============================================
-                    if not name:
-                        return
-                    clean = str(name).strip()
-                    if clean:
-                        tag_names.append(clean)
-                    # =============================================
-
-                # Regex used to slpit tag field like genre
-                split_re = r'[,/|;]+'
-
                 if isinstance(nfo_value, str):
-                    parts = re.split(split_re, nfo_value)
+                    parts = nfo_value.translate(TAG_SEPARATORS_TO_COMMA).split(",")
 
                     for part in parts:
-                        add_tag(part)
+                        append_clean_tag(tag_names, part)
 
                 elif isinstance(nfo_value, dict):
                     name = nfo_value.get("tag") or nfo_value.get("name")
-                    add_tag(name)
+                    append_clean_tag(tag_names, name)
 
                 elif isinstance(nfo_value, list):
                     for item in nfo_value:
                         if isinstance(item, str):
-                            parts = re.split(split_re, item)
+                            parts = item.translate(TAG_SEPARATORS_TO_COMMA).split(",")
 
                             for part in parts:
-                                add_tag(part)
+                                append_clean_tag(tag_names, part)
 
                         elif isinstance(item, dict):
                             name = item.get("tag") or item.get("name")
-                            add_tag(name)
+                            append_clean_tag(tag_names, name)
 
-                # Remove duplicates while preserving order
-                seen = set()
-                unique_tags = []
+                # Remove duplicates while preserving order (first spelling wins)
+                unique_by_lower = {}
 
                 for tag in tag_names:
                     clean = tag.strip()
 
-                    if not clean:
-                        continue
-
-                    lowered = clean.lower()
+                    if clean:
+                        unique_by_lower.setdefault(clean.lower(), clean)
 
-                    if lowered not in seen:
-                        seen.add(lowered)
-                        unique_tags.append(clean)
+                unique_tags = list(unique_by_lower.values())
 
                 if not unique_tags:
                     continue
@@ -928,57 +1644,54 @@ def update_plex_item_fields(plex_item, nfo_data, nfo_file=None):
                 # Retrieve current Plex tags for comparison
                 plex_attr = getattr(plex_item, rest_field, []) or []
 
-                existing_tags = []
-                for t in plex_attr:
-                    if isinstance(t, str):
-                        candidate = t.strip()
-
-                        if candidate:
-                            existing_tags.append(candidate)
-
-                    else:
-                        tagname = getattr(t, "tag", None) or getattr(t, "name", None) or None
-
-                        if tagname:
-                            candidate = str(tagname).strip()
+                # Extract, clean and deduplicate existing tag names in one pass (first spelling wins)
+                existing_by_lower = {}
 
-                            if candidate:
-                                existing_tags.append(candidate)
+                for t in plex_attr:
+                    tagname = t if isinstance(t, str) else (getattr(t, "tag", None) or getattr(t, "name", None))
 
-                # Deduplicate existing_tags while preserving order
-                seen_tmp = set()
-                clean_existing = []
+                    if not tagname:
+                        continue
 
-                for t in existing_tags:
-                    tl = t.lower()
+                    candidate = str(tagname).strip()
 
-                    if tl not in seen_tmp:
-                        seen_tmp.add(tl)
-                        clean_existing.append(t)
+                    if candidate:
+                        existing_by_lower.setdefault(candidate.lower(), candidate)
 
-                existing_tags = clean_existing
-                existing_lower = {t.lower() for t in existing_tags}
+                existing_tags = list(existing_by_lower.values())
                 # ------------------------------------------------------------
 
                 # Remove combined tags like "Action / Adventure" if they still contain separators
-                refined_tags = []
-                combined_seps = ["/", ",", "|", ";"]
+                refined_tags = [tag for tag in unique_tags if TAG_SEPARATORS.isdisjoint(tag)]
 
-                for tag in unique_tags:
-                    if any(sep in tag for sep in combined_seps):
-                        log("DEBUG", f"{item_title}: Skipping combined tag '{tag}'.")
-                        continue
-
-                    refined_tags.append(tag)
+                if len(refined_tags) != len(unique_tags):
+                    for tag in unique_tags:
+                        if not TAG_SEPARATORS.isdisjoint(tag):
+                            log("DEBUG", "%s: Skipping combined tag '%s'.", item_title, tag)
 
                 if not refined_tags:
                     continue
 
+                # Only the difference is sent to Plex: tags missing from Plex are added and,
+                # in replace mode (ALLOW_UNLOCK), tags no longer in the NFO are removed
+                tags_to_add = [t for t in refined_tags if t.lower() not in existing_by_lower]
+                tags_to_remove = []
+
+                if ALLOW_UNLOCK:
+                    refined_lower = {t.lower() for t in refined_tags}
+                    tags_to_remove = [t for t in existing_tags if t.lower() not in refined_lower]
+
+                if not tags_to_add and not tags_to_remove:
+                    log("DEBUG", "%s: Skipping unchanged tags '%s'.", item_title, rest_field)
+                    continue
+
                 planned_ops.append({
                     "type": "tag",
                     "rest_field": rest_field,  # plural collection name (e.g. "genres")
                     "new": refined_tags,
                     "existing": existing_tags,
+                    "add": tags_to_add,
+                    "remove": tags_to_remove,
                 })
 
             # SINGLE-VALUED FIELD HANDLING (title, studio, summary, etc.)
@@ -992,18 +1705,22 @@ def update_plex_item_fields(plex_item, nfo_data, nfo_file=None):
 
                 # If values are identical after normalization, skip
                 if new_value == current_value:
-                    log("DEBUG", f"{item_title}: Skipping unchanged field '{rest_field}'.")
+                    log("DEBUG", "%s: Skipping unchanged field '%s'.", item_title, rest_field)
                     continue
 
                 # Check if the field is locked (do this AFTER deciding there's a difference)
-                try:
-                    locked = plex_item.isLocked(rest_field)
-                except Exception:
-                    locked = False
+                # The lock state only matters when unlocking is not allowed, so it is not queried otherwise
+                locked = False
+
+                if not ALLOW_UNLOCK:
+                    try:
+                        locked = plex_item.isLocked(rest_field)
+                    except Exception:
+                        locked = False
 
                 # Skip locked fields if unlocking not allowed
-                if locked and not ALLOW_UNLOCK:
-                    log("DEBUG", f"{item_title}: Field '{rest_field}' locked (ALLOW_UNLOCK=False), skipping.")
+                if locked:
+                    log("DEBUG", "%s: Field '%s' locked (ALLOW_UNLOCK=False), skipping.", item_title, rest_field)
                     continue
 
                 planned_ops.append({
@@ -1019,40 +1736,42 @@ def update_plex_item_fields(plex_item, nfo_data, nfo_file=None):
         # Sentinel can tell the difference between does not exists (returns the sentinel), is empty/None/false or has a value (returns that value)
         # ========================================================================================================================================
         sentinel = object()
-        validated_ops = []
+        field_ops = []  # validated single-valued field edits
+        tag_ops = []    # validated tag collection edits
+        item_class = type(plex_item).__name__
 
         for op in planned_ops:
             rest = op["rest_field"]
+            is_field = op["type"] == "field"
 
-            if op["type"] == "field":
-                # For single-valued fields check the direct attribute presence
-                # If the attribute isn't present (getattr returns sentinel), skip the op
-                present = getattr(plex_item, rest, sentinel)
-
-                if present is sentinel:
-                    log("DEBUG", f"{item_title}: Field '{rest}' not present on item type '{item_type}', skipping planned op.")
-                    STATS.setdefault("skipped_missing_field", []).append(f"{item_title}: Missing field '{rest}'")
-                    continue
+            # Item classes already seen without this attribute are not asked again
+            missing = (item_class, rest) in MISSING_ITEM_FIELDS
 
-                validated_ops.append(op)
+            if not missing:
+                if is_field:
+                    # For single-valued fields check the direct attribute presence
+                    # If the attribute isn't present (getattr returns sentinel), skip the op
+                    missing = getattr(plex_item, rest, sentinel) is sentinel
 
-            else:  # tag operation
-                # rest is already the plural collection name for tags (e.g. "genres")
-                plex_tag_attr = getattr(plex_item, rest, sentinel)
-
-                if plex_tag_attr is sentinel:
+                else:  # tag operation
+                    # rest is already the plural collection name for tags (e.g. "genres")
                     # Fallback: some bindings are inconsistent — try singular as a last resort
-                    plex_tag_attr2 = getattr(plex_item, rest.rstrip('s'), sentinel)
+                    missing = (getattr(plex_item, rest, sentinel) is sentinel
+                               and getattr(plex_item, TAG_FIELD_SINGULAR.get(rest) or rest.rstrip('s'), sentinel) is sentinel)
 
-                    if plex_tag_attr2 is sentinel:
-                        log("DEBUG", f"{item_title}: Tag collection '{rest}' not present on item type '{item_type}', skipping planned op.")
-                        STATS.setdefault("skipped_missing_field", []).append(f"{item_title}: Missing tag collection '{rest}'")
-                        continue
+                if missing:
+                    MISSING_ITEM_FIELDS.add((item_class, rest))
 
-                validated_ops.append(op)
+            if missing:
+                kind = "Field" if is_field else "Tag collection"
+                log("DEBUG", "%s: %s '%s' not present on item type '%s', skipping planned op.", item_title, kind, rest, item_type)
+                STATS["skipped_missing_field"].append(f"{item_title}: Missing {kind.lower()} '{rest}'")
+                continue
 
-        # Replace planned_ops with validated_ops for the rest of the function
-        planned_ops = validated_ops
+            (field_ops if is_field else tag_ops).append(op)
+
+        # Replace planned_ops with the validated ops for the rest of the function (fields first, then tags)
+        planned_ops = field_ops + tag_ops
         # ============================================================
 
 
@@ -1060,14 +1779,14 @@ def update_plex_item_fields(plex_item, nfo_data, nfo_file=None):
         # Skip items with no detected changes (after validation)
         # -----------------------------------
         if not planned_ops:
-            log("INFO", f"'{item_title}': No metadata changes required. Will not update artwork.")
             STATS["skipped"].append(f"{item_title}: No metadata changes required.")
 
-            if ALWAYS_UPDATE_ART:
-                log("DEBUG", f"{item_title}: ALWAYS_UPDATE_ART=True, updating artwork despite no metadata changes.")
-                update_plex_item_artwork(plex_item, nfo_file)
+            if ALWAYS_UPDATE_ART or art_changed:
+                log("INFO", f"'{item_title}': No metadata changes required. Updating artwork (ALWAYS_UPDATE_ART={ALWAYS_UPDATE_ART}, artwork files changed={art_changed}).")
+                return update_plex_item_artwork(plex_item, nfo_file)
 
-            return
+            log("INFO", f"'{item_title}': No metadata changes required. Will not update artwork.")
+            return True
 
 
         # -----------------------------------------
@@ -1080,93 +1799,47 @@ def update_plex_item_fields(plex_item, nfo_data, nfo_file=None):
                 if op["type"] == "field":
                     log("INFO", f"  Field → {op['rest_field']} = '{op['value']}' (was: '{op.get('old_value','')}')")
                 else:
-                    log("INFO", f"  Tags → {op['rest_field']} (new: {op['new']}, existing: {op['existing']})")
+                    log("INFO", f"  Tags → {op['rest_field']} (add: {op['add']}, remove: {op['remove']}, existing: {op['existing']})")
 
             STATS["skipped"].append(f"{item_title}: Dry-run is activated.")
 
             update_plex_item_artwork(plex_item, nfo_file)
-            return
+            return False
 
 
         # ---------------------------------------
         # Apply updates using Plex batch edit API
         # ---------------------------------------
-        log("DEBUG", f"{item_title}: Preparing batch edits...")
+        log("DEBUG", "%s: Preparing batch edits...", item_title)
 
         # Debug: show brief planned_ops summary before starting edits
-        log("DEBUG", f"{item_title}: Planned operations summary: {len(planned_ops)} ops.")
+        log("DEBUG", "%s: Planned operations summary: %d ops.", item_title, len(planned_ops))
 
-        for op in planned_ops:
-            if op["type"] == "field":
-                log("DEBUG", f"  Field: {op['rest_field']}: '{op.get('old_value','')}' -> '{op['value']}'")
-            else:
-                log("DEBUG", f"  Tag: {op['rest_field']} -> add {len(op['new'])}, existing {len(op['existing'])}")
-
-        plex_item.batchEdits()
-
-        # Safe batching size to avoid Plex API URL limits
-        MAX_TAG_BATCH = 5
-
-        for op in planned_ops:
-            if op["type"] == "field":
-                # Apply field update
-                plex_item.editField(
-                    field=op["rest_field"],
-                    value=op["value"],
-                    locked=ALLOW_UNLOCK,
-                )
+        for op in field_ops:
+            log("DEBUG", "  Field: %s: '%s' -> '%s'", op["rest_field"], op.get("old_value", ""), op["value"])
 
-                log("DEBUG", f"{item_title}: Queued field '{op['rest_field']}' = '{op['value']}'")
+        for op in tag_ops:
+            log("DEBUG", "  Tag: %s -> add %d, remove %d, existing %d", op["rest_field"], len(op["add"]), len(op["remove"]), len(op["existing"]))
 
-            else:
-                # Apply tag updates
-                rest_field = op["rest_field"]  # plural collection name
-                refined_tags = op["new"]
-                existing_tags = op.get("existing", [])
-                existing_lower = {t.lower() for t in existing_tags}
+        plex_item.batchEdits()
 
-                if ALLOW_UNLOCK:
-                    # Remove all existing tags in small batches (if any)
-                    if existing_tags:
-                        for i in range(0, len(existing_tags), MAX_TAG_BATCH):
-                            plex_item.editTags(
-                                tag=rest_field,
-                                items=existing_tags[i:i+MAX_TAG_BATCH],
-                                remove=True,
-                                locked=True,
-                            )
-
-                    # Add new tags in safe chunks
-                    for i in range(0, len(refined_tags), MAX_TAG_BATCH):
-                        plex_item.editTags(
-                            tag=rest_field,
-                            items=refined_tags[i:i+MAX_TAG_BATCH],
-                            remove=False,
-                            locked=True,
-                        )
-
-                    log("DEBUG", f"{item_title}: Replaced all '{rest_field}' tags ({len(refined_tags)} total).")
+        # Apply field updates
+        for op in field_ops:
+            plex_item.editField(
+                field=op["rest_field"],
+                value=op["value"],
+                locked=ALLOW_UNLOCK,
+            )
 
-                else:
-                    # Append mode (no removal of existing tags)
-                    tags_to_add = [t for t in refined_tags if t.lower() not in existing_lower]
-
-                    if tags_to_add:
-                        for i in range(0, len(tags_to_add), MAX_TAG_BATCH):
-                            plex_item.editTags(
-                                tag=rest_field,
-                                items=tags_to_add[i:i+MAX_TAG_BATCH],
-                                remove=False,
-                                locked=True,
-                            )
-
-                        log("DEBUG", f"{item_title}: Added {len(tags_to_add)} new '{rest_field}' tags.")
-                    else:
-                        log("DEBUG", f"{item_title}: No new '{rest_field}' tags to append.")
+            log("DEBUG", "%s: Queued field '%s' = '%s'", item_title, op["rest_field"], op["value"])
 
+        # Apply tag updates
+        for op in tag_ops:
+            apply_tag_op(plex_item, op, item_title)
 
         # Commit all edits to Plex
-        log("DEBUG", f"Applying edits to '{item_title}'...")
+        log("DEBUG", "Applying edits to '%s'...", item_title)
+        PLEX_RATE_LIMITER.acquire()
         plex_item.saveEdits()
 
         # If we get here without exception, mark edits as applied (used to decide artwork upload)
@@ -1175,74 +1848,66 @@ def update_plex_item_fields(plex_item, nfo_data, nfo_file=None):
         log("SUCCESS", f"Successfully updated '{item_title}'.")
 
 
-        # -------------------------------------------
-        # Post-processing (statistics, reload, delay)
-        # -------------------------------------------
+        # ----------------------------------
+        # Post-processing (statistics, reload)
+        # ----------------------------------
         STATS["updated"].append(item_title)
 
-        if CUSTOM_DELAY > 0:
-            time.sleep(CUSTOM_DELAY)
-
         plex_item.reload()
 
     except Exception as e:
+        check_plex_throttling(e)
         log("ERROR", f"Error while updating '{item_title}': {e}")
         STATS["failed"].append(f"{item_title}: Error while updating.")
 
     # Finally: update the artwork based on NFO filename and if edits were applied
     if edits_applied or ALWAYS_UPDATE_ART:
-        log("DEBUG", f"{item_title}: Updating artwork (edits_applied={edits_applied}, ALWAYS_UPDATE_ART={ALWAYS_UPDATE_ART}).")
-        update_plex_item_artwork(plex_item, nfo_file)
+        log("DEBUG", "%s: Updating artwork (edits_applied=%s, ALWAYS_UPDATE_ART=%s).", item_title, edits_applied, ALWAYS_UPDATE_ART)
+
+        # Only in sync with the NFO when the artwork files were applied too
+        if not update_plex_item_artwork(plex_item, nfo_file):
+            return False
+
+    return edits_applied
 
 
 
 def update_plex_item_artwork(plex_item, file_path):
-    # ==================================
+    # ======================================================================================
     # Upload artwork file to a Plex item
-    # ==================================
-
-    global ALLOW_ART_EXT, DRY_RUN, CUSTOM_DELAY, STATS, ALLOW_UNLOCK, ALLOW_ART_UPDATE, time, os, log
+    # Returns False when an artwork file could not be applied (locked, unlock/upload failed)
+    # ======================================================================================
 
     # Not updating artwork if disabled
     if not ALLOW_ART_UPDATE:
         log("INFO", "Artwork updates are disabled by the ALLOW_ART_UPDATE global setting.")
-        return
+        return True
 
-    # Extract pats and filename components
-    base_name = os.path.basename(file_path)
-    base_stem, _ext = os.path.splitext(base_name)
-    dir_path = os.path.dirname(file_path)
-
-    # Map keywords for upload
-    artwork_map = {
-        "poster":    ("uploadPoster",    "thumb"),
-        "fanart":    ("uploadArt",       "art"),
-        "backdrop":  ("uploadArt",       "art"),
-        "background":("uploadArt",       "art"),
-        "art":       ("uploadArt",       "art"),
-        "theme":     ("uploadTheme",     "theme"),
-    }
+    # Extract paths and filename components (single split, extension cut at the last dot)
+    dir_path, base_name = os.path.split(file_path)
+    dot = base_name.rfind(".")
+    base_stem = base_name[:dot] if dot > 0 else base_name
+    lower_stem = base_stem.lower()
+
+    # Use keyword matching in the filename to find upload type (same stem for every extension: matched once)
+    keyword_method, keyword_field = next(
+        (upload for keyword, upload in ARTWORK_UPLOAD_MAP.items() if keyword in lower_stem),
+        (None, None),
+    )
 
-    # Normalized allowed artwork extensions
-    allowed_exts = {e.lower().lstrip(".") for e in ALLOW_ART_EXT}
     found_files = []
+    dir_file_names = get_dir_file_names(dir_path)
 
     # Search for artwork files
-    for ext in allowed_exts:
-        candidate = os.path.join(dir_path, f"{base_stem}.{ext}")
+    for ext in ALLOW_ART_EXT_NORMALIZED:
+        # Case-insensitive lookup ("Movie.JPG" matches "Movie.nfo" too), the file keeps its real name
+        candidate_name = dir_file_names.get(f"{lower_stem}.{ext}")
 
         # If the file exists, determine which artwork type it corresponds to
-        if os.path.isfile(candidate):
-            method = None
-            lock_field = None
-            lower_stem = base_stem.lower()
-
-            # Use keyword matching in the filename to find upload type
-            for keyword, (upload_method, field_name) in artwork_map.items():
-                if keyword in lower_stem:
-                    method = upload_method
-                    lock_field = field_name
-                    break
+        if candidate_name:
+            candidate = os.path.join(dir_path, candidate_name)
+            method = keyword_method
+            lock_field = keyword_field
 
             # Fallback: If no keyword found, assume a poster
             if method is None and ext in ("jpg", "jpeg", "png", "webp"):
@@ -1252,7 +1917,7 @@ def update_plex_item_artwork(plex_item, file_path):
             # Record valid artwork file for later processing
             if method:
                 found_files.append({
-                    "filename": os.path.basename(candidate),
+                    "filename": candidate_name,
                     "fullpath": candidate,
                     "method": method,
                     "lock_field": lock_field
@@ -1262,15 +1927,22 @@ def update_plex_item_artwork(plex_item, file_path):
     if not found_files:
         item_title = getattr(plex_item, 'title', 'Unknown Item')
         log("INFO", f"No artwork files found for '{item_title}' matching '{base_stem}'.")
-        return
+        return True
+
+    item_title = getattr(plex_item, 'title', 'Unknown Item')
+
+    # ------------------------------------------------------------------
+    # Check each matched file and collect the locked fields to unlock
+    # ------------------------------------------------------------------
+    uploads = []
+    all_applied = True  # False as soon as one artwork file cannot be applied
+    locked_fields = {}  # {lock_field: [filenames waiting for it]}
+    lock_states = {}    # {lock_field: is_locked}, several files can share a field (e.g. poster.jpg and poster.png)
 
-    # Looping through matched files
     for art_file in found_files:
         filename = art_file["filename"]
-        fullpath = art_file["fullpath"]
         method = art_file["method"]
         lock_field = art_file["lock_field"]
-        item_title = getattr(plex_item, 'title', 'Unknown Item')
 
         log("INFO", f"Processing '{filename}' for '{item_title}' (method: '{method}').")
 
@@ -1283,176 +1955,313 @@ def update_plex_item_artwork(plex_item, file_path):
 
         # If the field can be locked/unlocked, and we have a lock_field defined
         if lock_field:
-            is_locked = False
-            # some items may not implement isLocked for that field; catch exceptions
-            try:
-                is_locked = plex_item.isLocked(lock_field)
+            is_locked = lock_states.get(lock_field)
 
-            except Exception as e:
-                log("DEBUG", f"Could not determine lock state for field '{lock_field}' on '{item_title}': {e}")
-                is_locked = False  # assume unlocked
+            if is_locked is None:
+                # some items may not implement isLocked for that field; catch exceptions
+                try:
+                    is_locked = plex_item.isLocked(lock_field)
 
-            # Unlock file if it is locked
-            if is_locked:
-                if ALLOW_UNLOCK:
-                    log("INFO", f"Field '{lock_field}' is locked. Attempting unlock for '{item_title}'.")
-                    try:
-                        plex_item.edit(**{f"{lock_field}.locked": 0})
-                        plex_item.reload()
+                except Exception as e:
+                    log("DEBUG", "Could not determine lock state for field '%s' on '%s': %s", lock_field, item_title, e)
+                    is_locked = False  # assume unlocked
 
-                    except Exception as e:
-                        log("ERROR", f"Failed to unlock '{lock_field}' for '{item_title}': {e}")
-                        STATS["failed"].append(f"{item_title}: Unlock failed for {lock_field} ({filename}).")
-                        continue
+                lock_states[lock_field] = is_locked
 
-                else:
+            if is_locked:
+                if not ALLOW_UNLOCK:
                     log("WARNING", f"Skipping '{filename}' because field '{lock_field}' is locked and ALLOW_UNLOCK is False.")
                     STATS["skipped"].append(f"{item_title}: Artwork upload skipped, field locked ({filename}).")
+                    all_applied = False
                     continue
 
-        # Perform upload
+                locked_fields.setdefault(lock_field, []).append(filename)
+
+        uploads.append((art_file, upload_fn))
+
+    # ---------------------------------------------------
+    # Unlock every locked artwork field in a single edit
+    # ---------------------------------------------------
+    if locked_fields:
+        log("INFO", f"Field(s) {', '.join(sorted(locked_fields))} locked. Attempting unlock for '{item_title}'.")
+        try:
+            PLEX_RATE_LIMITER.acquire()
+            plex_item.edit(**{f"{lock_field}.locked": 0 for lock_field in locked_fields})
+            plex_item.reload()
+
+        except Exception as e:
+            check_plex_throttling(e)
+            log("ERROR", f"Failed to unlock {', '.join(sorted(locked_fields))} for '{item_title}': {e}")
+
+            for lock_field, filenames in locked_fields.items():
+                for filename in filenames:
+                    STATS["failed"].append(f"{item_title}: Unlock failed for {lock_field} ({filename}).")
+
+            all_applied = False
+            uploads = [(art_file, upload_fn) for art_file, upload_fn in uploads if art_file["lock_field"] not in locked_fields]
+
+    # ---------------------------------------------------
+    # Upload the files, then refresh the item only once
+    # ---------------------------------------------------
+    uploaded = False
+
+    for art_file, upload_fn in uploads:
+        filename = art_file["filename"]
+        method = art_file["method"]
+
         try:
             if DRY_RUN:
                 log("INFO", f"[DRY‑RUN] Would upload '{filename}' to '{item_title}' via '{method}'.")
             else:
-                upload_fn(filepath=fullpath)
+                PLEX_RATE_LIMITER.acquire()
+                upload_fn(filepath=art_file["fullpath"])
                 log("SUCCESS", f"Uploaded '{filename}' as {method} for '{item_title}'.")
                 STATS["updated"].append(f"{item_title}: Uploaded '{filename}' ({method})")
-
-                time.sleep(CUSTOM_DELAY)
-
-                # Reload data
-                try:
-                    plex_item.refresh()
-                    plex_item.reload()
-                except Exception as e:
-                    log("DEBUG", f"Reload failed for '{item_title}' after upload: {e}")
+                uploaded = True
 
         except Exception as e:
+            check_plex_throttling(e)
             log("ERROR", f"Failed to upload '{filename}' for '{item_title}': {e}")
             STATS["failed"].append(f"{item_title}: Artwork upload failed ({filename}).")
+            all_applied = False
             continue
 
+    # Reload data
+    if uploaded:
+        try:
+            plex_item.refresh()
+            plex_item.reload()
+        except Exception as e:
+            log("DEBUG", "Reload failed for '%s' after upload: %s", item_title, e)
 
+    return all_applied
 
-def process_data(data={}, automatic_mode=True):
-    # =======================================================================================================================================
-    # Main processing function: Iterates through discovered media, resolves them to Plex items, and triggers updates for metadata and artwork
-    # =======================================================================================================================================
 
-    if not data:
-        log("ERROR", "There is no data to work with. Exiting...")
+
+def process_nfo(nfo_file, parent_plex_item, automatic_mode=True):
+    # =======================================================================================
+    # Process one NFO file: parse it, find the matching Plex item under its parent and update it
+    # Runs in worker threads in automatic mode (see process_data)
+    # =======================================================================================
+
+    with STATS_LOCK:
+        STATS["processed_nfo"] += 1
+
+    plex_item = None
+    log("INFO", f"Processing NFO file: {nfo_file}")
+
+    file_state = get_nfo_file_state(nfo_file)
+    sync_context = get_nfo_sync_context(nfo_file)
+
+    nfo_data = load_nfo_data(nfo_file, file_state)
+
+    if not nfo_data or not nfo_data.get("title"):
+        log("WARN", f"NFO file '{nfo_file}' is empty or missing a title. Skipping.")
+        STATS["skipped"].append(f"{nfo_file}: NFO empty or missing title.")
         return
 
-    global ROOT_PLEX_SHOW_DIR, ROOT_PLEX_MOVIE_DIR, SUPPORTED_FIELD_MAP, ALLOW_UNLOCK, DRY_RUN, CUSTOM_DELAY, STATS
+    # File touched but same content: nothing to send to Plex
+    nfo_digest = get_nfo_digest(nfo_data)
 
-    for media_parent_title, media_info in data.items():
-        log("INFO", f"Processing parent folder '{media_parent_title}' at path '{media_info['path']}'.")
+    if is_nfo_unchanged(nfo_file, file_state, nfo_digest, sync_context):
+        log("DEBUG", "NFO content unchanged since last run, skipping: %s", nfo_file)
 
-        path_parts = media_info["path"].lower().split(os.path.sep)
-        parent_media_type = None
+        with STATS_LOCK:
+            STATS["unchanged_nfo"] += 1
 
-        if any(part in path_parts for part in ROOT_PLEX_SHOW_DIR):
-            parent_media_type = "show"
+        remember_nfo_state(nfo_file, file_state, nfo_digest, sync_context)
+        return
 
-        elif any(part in path_parts for part in ROOT_PLEX_MOVIE_DIR):
-            parent_media_type = "movie"
+    # Same NFO content but new/replaced artwork files: they are uploaded even without metadata changes
+    art_changed = nfo_art_changed(nfo_file, sync_context)
 
-        parent_plex_item = resolve_plex_item(media_parent_title, parent_media_type, automatic_mode)
+    media_type = get_media_type_from_nfo(nfo_data)
+    nfo_title = nfo_data.get("title")
 
-        if not parent_plex_item:
-            log("WARN", f"Could not resolve parent item for '{media_parent_title}'. Skipping all files within.")
-            STATS["skipped"].append(f"{media_parent_title}: Could not resolve parent item in Plex.")
-            continue
+    # Handling show/season/episode
+    if parent_plex_item.type == "show" and media_type in ["show", "season", "episode"]:
+        try:
+            if media_type == "show":
+                # Directly use the show item
+                plex_item = parent_plex_item
+
+            elif media_type == "season":
+                # Try to find the season within the show
+                season_num = nfo_data.get("season") or nfo_data.get("seasonnumber")
 
-        log("SUCCESS", f"Resolved parent '{media_parent_title}' to Plex {parent_plex_item.type}: '{parent_plex_item.title}'.")
+                if season_num:
+                    season_num = int(season_num)
+                    log("INFO", f"Directly looking for Season {season_num} in '{parent_plex_item.title}'.")
 
-        for nfo_file in media_info["files"]:
-            STATS["processed_nfo"] += 1
+                    # All seasons of the show are listed once and shared by its NFO files
+                    plex_item = get_plex_child_index(parent_plex_item, "seasons").get(season_num) or parent_plex_item.season(season=season_num)
+
+            elif media_type == "episode":
+                # Try to find the episode within a specific season
+                season_num = nfo_data.get("season")
+                episode_num = nfo_data.get("episode") or nfo_data.get("episodenumber")
+
+                if season_num and episode_num:
+                    season_num = int(season_num)
+                    episode_num = int(episode_num)
+
+                    try:
+                        log("INFO", f"Directly looking for S{season_num:02d}E{episode_num:02d} in '{parent_plex_item.title}'.")
+
+                        # All episodes of the show are listed once and shared by its NFO files (no request per episode)
+                        plex_item = get_plex_child_index(parent_plex_item, "episodes").get((season_num, episode_num))
+
+                        if not plex_item:
+                            # Getting season
+                            season = parent_plex_item.season(season_num)
+
+                            # Getting episode
+                            plex_item = season.episode(episode_num)
+
+                    except:
+                        # Fallback search: Looping over episodes in season
+                        log("WARN", f"Direct lookup failed for S{season_num:02d}E{episode_num:02d} in '{parent_plex_item.title}'. Falling back to loop search.")
+                        plex_item = None
+
+                        try:
+                            # Getting season
+                            season = parent_plex_item.season(season_num)
+
+                            # Iterate through all known episodes in this season
+                            for ep in season.episodes():
+                                if ep.index == episode_num:
+                                    plex_item = ep
+                                    log("DEBUG", "Found episode by iterating index (%s) for S%02dE%02d in '%s'.", ep.index, season_num, episode_num, parent_plex_item.title)
+                                    break
+
+                        except Exception as e:
+                            log("DEBUG", "Could not find episode for S%02dE%02d in '%s'. Falling back to search.", season_num, episode_num, parent_plex_item.title)
+                            plex_item = None
+
+        except Exception as e:
+            log("ERROR", f"Failed to directly find {media_type} from parent '{parent_plex_item.title}': {e}. Falling back to search.")
             plex_item = None
-            log("INFO", f"Processing NFO file: {nfo_file}")
 
-            nfo_data = parse_nfo_to_dict(nfo_file)
+    # Movie/show NFO in the folder of its parent, matched by path in the library index: that exact item
+    if not plex_item and media_type in ("movie", "show") and parent_plex_item.type == media_type and PLEX_INDEX:
+        folder_item = PLEX_INDEX["by_path"].get(normalize_path(os.path.dirname(nfo_file)))
 
-            if not nfo_data or not nfo_data.get("title"):
-                log("WARN", f"NFO file '{nfo_file}' is empty or missing a title. Skipping.")
-                STATS["skipped"].append(f"{nfo_file}: NFO empty or missing title.")
-                continue
+        if folder_item is not None and folder_item.ratingKey == parent_plex_item.ratingKey:
+            plex_item = parent_plex_item
 
-            media_type = get_media_type_from_nfo(nfo_data)
-            nfo_title = nfo_data.get("title")
+    # Movie/show NFO with external IDs: exact lookup before any title search
+    if not plex_item and media_type in ("movie", "show") and nfo_data.get("_ids"):
+        plex_item = find_plex_item_by_ids(nfo_data["_ids"], media_type, os.path.dirname(nfo_file))
 
-            # Handling show/season/episode
-            if parent_plex_item.type == "show" and media_type in ["show", "season", "episode"]:
-                try:
-                    if media_type == "show":
-                        # Directly use the show item
-                        plex_item = parent_plex_item
+    # Fallback
+    if not plex_item:
+        plex_item = resolve_plex_item(nfo_title, media_type, automatic_mode, parent_plex_item)
 
-                    elif media_type == "season":
-                        # Try to find the season within the show
-                        season_num = nfo_data.get("season") or nfo_data.get("seasonnumber")
+    if not plex_item:
+        log("WARN", f"Could not resolve a Plex item for '{nfo_title}'. Update skipped.")
+        STATS["skipped"].append(f"{nfo_title} ({nfo_file}): Could not resolve Plex item.")
+        return
 
-                        if season_num:
-                            season_num = int(season_num)
-                            log("INFO", f"Directly looking for Season {season_num} in '{parent_plex_item.title}'.")
-                            plex_item = parent_plex_item.season(season=season_num)
+    log("SUCCESS", f"Matched NFO '{nfo_title}' to Plex item '{plex_item.title}'. Starting update process.")
 
-                    elif media_type == "episode":
-                        # Try to find the episode within a specific season
-                        season_num = nfo_data.get("season")
-                        episode_num = nfo_data.get("episode") or nfo_data.get("episodenumber")
+    # --- Pass the parent_plex_item for fallback  ---
+    # Several NFO files can resolve to the same Plex item (e.g. movie.nfo and <name>.nfo): never edit it concurrently
+    with get_plex_item_lock(plex_item):
+        if update_plex_item_fields(plex_item, nfo_data, nfo_file, art_changed):
+            remember_nfo_state(nfo_file, file_state, nfo_digest, sync_context)
 
-                        if season_num and episode_num:
-                            season_num = int(season_num)
-                            episode_num = int(episode_num)
 
-                            try:
-                                log("INFO", f"Directly looking for S{season_num:02d}E{episode_num:02d} in '{parent_plex_item.title}'.")
+def process_data(data={}, automatic_mode=True):
+    # =======================================================================================================================================
+    # Main processing function: Iterates through discovered media, resolves them to Plex items, and triggers updates for metadata and artwork
+    # =======================================================================================================================================
 
-                                # Getting season
-                                season = parent_plex_item.season(season_num)
+    if not data:
+        log("ERROR", "There is no data to work with. Exiting...")
+        return
 
-                                # Getting episode
-                                plex_item = season.episode(episode_num)
+    # One worker pool for the whole run (automatic mode): files of different folders overlap too
+    pool = ThreadPoolExecutor(max_workers=MAX_WORKERS) if automatic_mode and MAX_WORKERS > 1 else None
+    futures = {}
 
-                            except:
-                                # Fallback search: Looping over episodes in season
-                                log("WARN", f"Direct lookup failed for S{season_num:02d}E{episode_num:02d} in '{parent_plex_item.title}'. Falling back to loop search.")
-                                plex_item = None
+    try:
+        for media_parent_title, media_info in data.items():
+            log("INFO", f"Processing parent folder '{media_parent_title}' at path '{media_info['path']}'.")
 
-                                try:
-                                    # Getting season
-                                    season = parent_plex_item.season(season_num)
+            # Leave out NFO files unchanged since their last successful update (quick mtime/size check)
+            nfo_files = []
 
-                                    # Iterate through all known episodes in this season
-                                    for ep in season.episodes():
-                                        if ep.index == episode_num:
-                                            plex_item = ep
-                                            log("DEBUG", f"Found episode by iterating index ({ep.index}) for S{season_num:02d}E{episode_num:02d} in '{parent_plex_item.title}'.")
-                                            break
+            for nfo_file in media_info["files"]:
+                if is_nfo_unchanged(nfo_file, get_nfo_file_state(nfo_file)):
+                    log("DEBUG", "NFO file unchanged since last run, skipping: %s", nfo_file)
 
-                                except Exception as e:
-                                    log("DEBUG", f"Could not find episode for S{season_num:02d}E{episode_num:02d} in '{parent_plex_item.title}'. Falling back to search.")
-                                    plex_item = None
+                    with STATS_LOCK:
+                        STATS["unchanged_nfo"] += 1
 
-                except Exception as e:
-                    log("ERROR", f"Failed to directly find {media_type} from parent '{parent_plex_item.title}': {e}. Falling back to search.")
-                    plex_item = None
+                else:
+                    nfo_files.append(nfo_file)
 
-            # Fallback
-            if not plex_item:
-                plex_item = resolve_plex_item(nfo_title, media_type, automatic_mode, parent_plex_item)
+            if not nfo_files:
+                log("INFO", f"All NFO files of '{media_parent_title}' are unchanged since last run. Skipping (use --force to process them).")
+                continue
 
-            if not plex_item:
-                log("WARN", f"Could not resolve a Plex item for '{nfo_title}'. Update skipped.")
-                STATS["skipped"].append(f"{nfo_title} ({nfo_file}): Could not resolve Plex item.")
+            path_parts = frozenset(media_info["path"].lower().split(os.path.sep))
+            parent_media_type = None
+
+            if not ROOT_PLEX_SHOW_DIR_LOWER.isdisjoint(path_parts):
+                parent_media_type = "show"
+
+            elif not ROOT_PLEX_MOVIE_DIR_LOWER.isdisjoint(path_parts):
+                parent_media_type = "movie"
+
+            # Folder already known by Plex: no search needed
+            parent_plex_item = PLEX_INDEX["by_path"].get(normalize_path(media_info["path"])) if PLEX_INDEX else None
+
+            if parent_plex_item:
+                log("DEBUG", "Matched folder '%s' to Plex item '%s' from the library index.", media_info['path'], parent_plex_item.title)
+            else:
+                parent_plex_item = resolve_plex_item(media_parent_title, parent_media_type, automatic_mode)
+
+            if not parent_plex_item:
+                log("WARN", f"Could not resolve parent item for '{media_parent_title}'. Skipping all files within.")
+                STATS["skipped"].append(f"{media_parent_title}: Could not resolve parent item in Plex.")
                 continue
 
-            log("SUCCESS", f"Matched NFO '{nfo_title}' to Plex item '{plex_item.title}'. Starting update process.")
+            log("SUCCESS", f"Resolved parent '{media_parent_title}' to Plex {parent_plex_item.type}: '{parent_plex_item.title}'.")
+
+            # Interactive mode may prompt the user, so NFO files are processed one by one there
+            if pool is None:
+                for nfo_file in nfo_files:
+                    process_nfo(nfo_file, parent_plex_item, automatic_mode)
+
+                continue
 
-            # --- Pass the parent_plex_item for fallback  ---
-            update_plex_item_fields(plex_item, nfo_data, nfo_file)
+            # Queue the files on the shared pool: the next parent folder is resolved while they run
+            for nfo_file in nfo_files:
+                futures[pool.submit(process_nfo, nfo_file, parent_plex_item, automatic_mode)] = nfo_file
+
+        # Automatic mode: wait for every queued NFO file (writes go through PLEX_RATE_LIMITER)
+        for future in as_completed(futures):
+            try:
+                future.result()
+
+            except Exception as e:
+                log("ERROR", f"Unexpected error while processing '{futures[future]}': {e}")
+                STATS["failed"].append(f"{futures[future]}: Unexpected error while processing.")
+
+    except BaseException:
+        # Ctrl-C, SIGTERM (SystemExit) or an error: drop the queued NFO files, only the running ones finish
+        if futures:
+            log("WARN", "Interrupted: cancelling the NFO files not started yet...")
+
+            for future in futures:
+                future.cancel()
+
+        raise
+
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
 
     # Provide statistics once everything is processed
     summarize_results(STATS)
@@ -1467,12 +2276,13 @@ def summarize_results(STATS):
         print("\nNo statistics were generated.")
         return
 
-    global DEBUG_MODE, DRY_RUN
-
     print("\n\n" + "="*20 + " SUMMARY " + "="*20)
     print(f"Dry-run mode: {'ON (no changes were made)' if DRY_RUN else 'OFF (changes were applied)'}")
     print(f"Processed NFO files: {STATS.get('processed_nfo', 0)}")
 
+    if STATS.get("unchanged_nfo"):
+        print(f"Unchanged NFO files (skipped, use --force to process them): {STATS['unchanged_nfo']}")
+
     # Use set to remove duplicate update messages
     unique_updates = sorted(list(set(STATS.get("updated", []))))
 
@@ -1516,14 +2326,181 @@ def summarize_results(STATS):
 # MAIN SCRIPT #
 ###############
 
+def parse_arguments():
+    # ============================
+    # Parse command-line arguments
+    # ============================
+
+    parser = argparse.ArgumentParser(description=f"{SCRIPT_NAME} (Movies/Series)")
+
+    parser.add_argument("--dry-run",            action="store_true",        dest="dry_run",             default=None,   help="Don't perform edits/uploads; just print intended actions")
+    parser.add_argument("--debug-mode",         action="store_true",        dest="debug_mode",          default=False,  help="Enable debug-level console output")
+    parser.add_argument("--scan-path",                                      dest="scan_path",type=str,  default=None,   help="Path to scan (non-interactive mode)")
+    parser.add_argument("--logging",            action="store_true",        dest="logging",             default=True,   help="Enable/disable logging to file (default: ON)")
+    parser.add_argument("--no-logging",         action="store_false",       dest="logging",                             help="Disable logging to file")
+    parser.add_argument("--allow-unlock",       action="store_true",        dest="allow_unlock",        default=True,   help="Allow unlocking locked fields before editing")
+    parser.add_argument("--no-unlock",          action="store_false",       dest="allow_unlock",                        help="Disallow unlocking locked fields")
+    parser.add_argument("--update-art",         action="store_true",        dest="update_art",          default=True,   help="Enable artwork updates (default: ON)")
+    parser.add_argument("--no-art",             action="store_false",       dest="update_art",                          help="Disable artwork updates")
+    parser.add_argument("--always-update-art",  action="store_true",        dest="always_update_art",   default=False,  help="Force artwork updates even if metadata hasn't changed (except in dry-run)")
+    parser.add_argument("--force",              action="store_true",        dest="force",               default=False,  help="Process every NFO file, even those unchanged since the last successful run")
+    parser.add_argument("--workers",                                        dest="workers",  type=int,  default=None,   help="Number of NFO files processed in parallel in automatic mode (default: MAX_WORKERS, 1 = one by one)")
+
+    return parser.parse_args()
+
+
+def setup_file_logging():
+    # ====================================================================================
+    # Log file: rotating file handler behind a memory buffer (flushed every 200 records,
+    # on errors and at exit); LOG_LEVEL (.env) can raise the file log level, e.g. WARNING
+    # ====================================================================================
+
+    logger.setLevel(LOG_LEVELS.get(os.environ.get("LOG_LEVEL", "DEBUG" if DEBUG_MODE else "INFO").upper(), logging.INFO))
+
+    if not LOGGING:
+        return
+
+    try:
+        log_file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=10_000_000, backupCount=3, encoding="utf-8")
+        log_file_handler.setFormatter(logging.Formatter("%(asctime)s [%(label)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+        logger.addHandler(logging.handlers.MemoryHandler(capacity=200, flushLevel=logging.ERROR, target=log_file_handler))
+
+    except OSError as e:
+        print(f"WARNING: Cannot open log file '{LOG_FILE}' ({e}); logging to console only.")
+
+    # Buffered log lines are flushed by logging.shutdown() at exit; turn SIGTERM (e.g. cron/systemd stop)
+    # into a normal exit so they are not lost when the run is killed
+    try:
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+    except (ValueError, OSError, AttributeError):
+        pass
+
+
+def open_nfo_state_cache():
+    # ==========================================================================
+    # Open the cache of NFO files already applied to Plex (None if unavailable)
+    # ==========================================================================
+
+    try:
+        return diskcache.Cache(CACHE_DIR)
+
+    except Exception as e:
+        print(f"WARNING: Cannot open cache directory '{CACHE_DIR}' ({e}); every NFO file will be processed.")
+        return None
+
+
+def connect_to_plex():
+    # ==============================================================================
+    # Resolve the Plex settings (configuration or .env) and connect to the server
+    # Exits the script when the settings are missing/invalid or Plex is unreachable
+    # ==============================================================================
+
+    global PLEX_URL, PLEX_TOKEN, PLEX_RPS, PLEX_SESSION
+
+    # If not changed in configurations, get value from .env
+    if not PLEX_URL:
+        PLEX_URL = os.environ.get("PLEX_URL")
+
+    if not PLEX_TOKEN:
+        PLEX_TOKEN = os.environ.get("PLEX_TOKEN")
+
+    if not PLEX_URL or not PLEX_TOKEN:
+        print(f"\n{COLOR['RED']}ERROR{COLOR['RESET']}: PLEX_URL and PLEX_TOKEN must be set in a .env file or environment variables.")
+        print("Create a .env with:")
+        print("  PLEX_URL=http://your-plex:32400")
+        print("  PLEX_TOKEN=xxxxxxxxxxxxxxxx")
+        sys.exit(1)
+
+    if PLEX_RPS is None:
+        try:
+            PLEX_RPS = float(os.environ.get("PLEX_RPS") or 10)
+
+        except ValueError:
+            print(f"\n{COLOR['RED']}ERROR{COLOR['RESET']}: PLEX_RPS must be a number (requests per second), got '{os.environ.get('PLEX_RPS')}'.")
+            sys.exit(1)
+
+    # Remove trailing slash from Plex URL (for consistency)
+    PLEX_URL = PLEX_URL.rstrip("/")
+
+    # Shared HTTP session: keeps connections to Plex alive and retries transient errors (with backoff)
+    # The pool holds at least one connection per worker, so no worker has to open a throwaway connection
+    PLEX_SESSION = requests.Session()
+    plex_http_adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=max(16, MAX_WORKERS),
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False),
+    )
+    PLEX_SESSION.mount("http://", plex_http_adapter)
+    PLEX_SESSION.mount("https://", plex_http_adapter)
+
+    # Connect to Plex
+    try:
+        plex_server = PlexServer(PLEX_URL, PLEX_TOKEN, session=PLEX_SESSION, timeout=PLEX_TIMEOUT)
+        print(f"{COLOR['GREEN']}SUCCESS{COLOR['RESET']}: Connected to Plex at {PLEX_URL}\n")
+
+    except Exception as e:
+        print(f"{COLOR['RED']}ERROR{COLOR['RESET']}: Failed to connect to Plex at {PLEX_URL}: {e}\n")
+        sys.exit(1)
+
+    return plex_server
+
+
 def main():
+    # ==== RUNTIME SETUP (command line, .env, log file, cache, Plex connection) ====
+    global LOGGING, ALLOW_UNLOCK, ALLOW_ART_UPDATE, ALWAYS_UPDATE_ART, DRY_RUN, DEBUG_MODE, SCAN_PATH, FORCE_UPDATE, MAX_WORKERS
+    global NFO_STATE_CACHE, PLEX_RATE_LIMITER, PLEX_INDEX, plex
+
+    # Load environment variables
+    load_dotenv()
+
+    # Assign parsed arguments to globals
+    args = parse_arguments()
+
+    LOGGING = args.logging
+    ALLOW_UNLOCK = args.allow_unlock
+    ALLOW_ART_UPDATE = args.update_art
+    ALWAYS_UPDATE_ART = args.always_update_art
+    DRY_RUN = args.dry_run
+    DEBUG_MODE = args.debug_mode
+    SCAN_PATH = args.scan_path
+    FORCE_UPDATE = args.force
+
+    if args.workers is not None:
+        MAX_WORKERS = max(1, args.workers)
+
+    # Debug print summary
+    if DEBUG_MODE:
+        print(f"[DEBUG] {SCRIPT_NAME} configuration:")
+        print(f"  LOGGING:            {LOGGING}")
+        print(f"  ALLOW_UNLOCK:       {ALLOW_UNLOCK}")
+        print(f"  ALLOW_ART_UPDATE:   {ALLOW_ART_UPDATE}")
+        print(f"  ALWAYS_UPDATE_ART:  {ALWAYS_UPDATE_ART}")
+        print(f"  DRY_RUN:            {DRY_RUN}")
+        print(f"  SCAN_PATH:          {SCAN_PATH}")
+        print(f"  FORCE_UPDATE:       {FORCE_UPDATE}")
+        print(f"  MAX_WORKERS:        {MAX_WORKERS}")
+        print(f"  LOG_FILE:           {LOG_FILE}")
+        print(f"  LOG_LEVEL:          {os.environ.get('LOG_LEVEL', 'DEBUG' if DEBUG_MODE else 'INFO')}")
+
+    setup_file_logging()
+    NFO_STATE_CACHE = open_nfo_state_cache()
+
+    # Enable ANSI escape characters in terminal (for Windows)
+    try:
+        os.system("")
+    except Exception:
+        pass
+
+    plex = connect_to_plex()
+    PLEX_RATE_LIMITER = RateLimiter(PLEX_RPS)
+    # ==============================================================================
+
     log("INFO", f"{SCRIPT_NAME} started.")
     print("Dry-run mode:", "ON (no changes)" if DRY_RUN else "OFF (changes will be applied)")
 
     # ==== REQUIRED VARIABLES ====
-    global ROOT_PLEX_MOVIE_DIR, ROOT_PLEX_SHOW_DIR, SCAN_PATH
-
-    ROOT_PLEX_DIR = ROOT_PLEX_SHOW_DIR + ROOT_PLEX_MOVIE_DIR
+    ROOT_PLEX_DIR = ROOT_PLEX_SHOW_DIR | ROOT_PLEX_MOVIE_DIR
     data = {}
     nfo_files = []
     automatic_mode = True
@@ -1534,6 +2511,9 @@ def main():
         print("Interactive mode:")
         automatic_mode = False
 
+        # Enable auto complete TAB
+        enable_tab_completion()
+
         # Setting SCAN_PATH
         raw_path = input("Enter path (directory) to operate on (TAB for autocompletion): ").strip()
         if not raw_path:
@@ -1550,12 +2530,7 @@ def main():
 
     # ==== Searching NFO files and sorting them out based on ROOT_PLEX_DIR ====
     # Recursively find all .nfo files and sort them
-    for root, _, files in os.walk(SCAN_PATH):
-        for file in files:
-            if file.lower().endswith(".nfo"):
-                nfo_files.append(os.path.join(root, file))
-
-    nfo_files.sort()
+    nfo_files = sorted(find_nfo_files(SCAN_PATH))
 
 
     if len(nfo_files) == 0:
@@ -1563,30 +2538,45 @@ def main():
 
     log("INFO", f"{len(nfo_files)} NFO files found. Sorting files and setting root directory...")
 
-    root_dirs_lower = [r.lower() for r in ROOT_PLEX_DIR]
+    root_dirs_lower = frozenset(r.lower() for r in ROOT_PLEX_DIR)
 
     # Sorting files and setting root directory inside data
+    # NFO files of a folder share the same top-level dir: the path is split and matched once per folder
+    dir_top_paths = {}  # {nfo directory: top-level dir, "" if the directory is a root dir itself, None if no root dir}
+
     for nfo in nfo_files:
-        norm = os.path.normpath(nfo)
-        parts = norm.split(os.path.sep)
-
-        # Find which root type this file belongs to
-        for idx, part in enumerate(parts):
-            if part.lower() in root_dirs_lower:
-                # Build top-level dir (e.g., /mnt/media/tv/Show)
-                end_idx = idx + 2  # "root_dir" + next level (show/movie folder)
-                top_path = os.path.join(*parts[:end_idx])
-                top_path = os.path.normpath(top_path)
-                basename = os.path.basename(top_path)
-
-                if basename not in data:
-                    data[basename] = {"id": 0,
-                                      "path":f"{top_path}",
-                                      "files": []
-                                      }
-
-                data[basename]["files"].append(nfo)
-                break  # Stop once we’ve matched a root
+        nfo_dir = os.path.dirname(os.path.normpath(nfo))
+        top_path = dir_top_paths.get(nfo_dir, False)
+
+        if top_path is False:
+            top_path = None
+            parts = nfo_dir.split(os.path.sep)
+
+            # Find which root type this folder belongs to
+            for idx, part in enumerate(parts):
+                if part.lower() in root_dirs_lower:
+                    # Build top-level dir (e.g., /mnt/media/tv/Show): "root_dir" + next level (show/movie folder)
+                    top_path = os.path.normpath(os.path.sep.join(parts[:idx + 2])) if idx + 1 < len(parts) else ""
+                    break  # Stop once we’ve matched a root
+
+            dir_top_paths[nfo_dir] = top_path
+
+        if top_path is None:
+            continue
+
+        # NFO file directly inside a root dir: the file itself is the next level
+        if not top_path:
+            top_path = os.path.normpath(nfo)
+
+        basename = os.path.basename(top_path)
+
+        if basename not in data:
+            data[basename] = {"id": 0,
+                              "path":f"{top_path}",
+                              "files": []
+                              }
+
+        data[basename]["files"].append(nfo)
 
     # DEBUGGING: Printing data found
     """
@@ -1596,7 +2586,8 @@ def main():
             print(f"  - {f}")
     """
 
-    # Process all data
+    # Fetch the Plex libraries once, then process all data
+    PLEX_INDEX = build_plex_index(plex)
     process_data(data, automatic_mode)
 
 